@@ -19,7 +19,10 @@ proxies its calls to the API through Mycroft's officially supported API,
 Selene.  The Selene API is also used to get geographical information about the
 city name provided in the request.
 """
+import asyncio
 from datetime import datetime
+from os.path import join
+from threading import Thread
 from time import sleep
 from typing import List
 
@@ -30,10 +33,12 @@ from lingua_franca.format import (
     get_date_strings
 )
 from ovos_bus_client.message import Message
+from ovos_config.locations import get_xdg_cache_save_path
 from ovos_utils import classproperty
 from ovos_utils.intents import IntentBuilder
 from ovos_utils.log import LOG
 from ovos_utils.process_utils import RuntimeRequirements
+from ovos_utils.time import now_local
 from ovos_workshop.decorators import intent_handler, skill_api_method
 from ovos_workshop.skills import OVOSSkill
 from requests import HTTPError
@@ -53,7 +58,26 @@ from .weather_helpers import (
     WeatherIntent,
     WeatherReport,
     WeeklyDialog,
-    get_report
+    FORECAST_CACHE,
+    MAX_FORECAST_DAYS,
+    PROFILE_MINIMAL,
+    PROFILE_STANDARD,
+    BACKEND_REDIS,
+    BACKEND_SQLITE,
+    BackendForecastStore,
+    ForecastStore,
+    OpenMeteoClient,
+    PrefetchScheduler,
+    async_get_report,
+    async_refresh_report,
+    cancel_refreshes,
+    create_backend,
+    get_profile,
+    load_forecast_store,
+    set_current_ttl,
+    set_forecast_store,
+    set_geolocation_cache,
+    set_grid_resolution
 )
 
 TWELVE_HOUR = "half"
@@ -75,9 +99,96 @@ class WeatherSkill(OVOSSkill):
                                    no_gui_fallback=True)
 
     def initialize(self):
+        self.weather_client = OpenMeteoClient()
+        # network lookups of every handler are awaited on a single loop
+        self.event_loop = asyncio.new_event_loop()
+        self._loop_thread = Thread(target=self.event_loop.run_forever,
+                                   name=f"{self.skill_id}.event_loop",
+                                   daemon=True)
+        self._loop_thread.start()
         # TODO - skill api
         self.bus.on("skill-ovos-weather.openvoiceos.weather.request",
                     self.get_current_weather_homescreen)
+        cache_dir = join(get_xdg_cache_save_path(), self.skill_id)
+        backend_name = self.settings.get("store_backend", BACKEND_SQLITE)
+        if backend_name == "files":
+            self.forecast_store = ForecastStore(cache_dir)
+        else:
+            # sqlite is shared by every skill process on the host and redis
+            # by every device using the server
+            backend = create_backend(backend_name,
+                                     path=join(cache_dir, "forecasts.db"),
+                                     url=self.settings.get("redis_url"))
+            self.forecast_store = BackendForecastStore(backend)
+            if backend_name == BACKEND_REDIS:
+                # a fleet wide store is bounded by the server eviction policy
+                self.forecast_store.max_entries = None
+            set_geolocation_cache(backend)
+        set_forecast_store(self.forecast_store)
+        self.prefetch = PrefetchScheduler()
+        self.add_event("recognizer_loop:utterance", self._on_user_activity)
+        self.settings_change_callback = self.on_settings_changed
+        self.on_settings_changed()
+        load_forecast_store()
+        if self.settings.get("prefetch_home", True):
+            self._schedule_prefetch(when=now_local())
+
+    def on_settings_changed(self):
+        """Apply the forecast cache settings."""
+        FORECAST_CACHE.configure(ttl=self.settings.get("cache_ttl"),
+                                 max_entries=self.settings.get("cache_size"),
+                                 grace=self.settings.get("cache_grace"))
+        set_grid_resolution(self.settings.get("grid_resolution"))
+        set_current_ttl(self.settings.get("current_ttl"))
+        if self.settings.get("store_max_age"):
+            self.forecast_store.max_age = float(self.settings["store_max_age"])
+        if self.settings.get("store_size") and self.forecast_store.max_entries:
+            self.forecast_store.max_entries = int(self.settings["store_size"])
+        self.prefetch.configure(
+            interval=self.settings.get("prefetch_interval"),
+            idle_timeout=self.settings.get("prefetch_idle_timeout"),
+            quiet_start=self.settings.get("quiet_hours_start"),
+            quiet_end=self.settings.get("quiet_hours_end")
+        )
+        self._schedule_prefetch()
+
+    def _schedule_prefetch(self, when: datetime = None):
+        """Schedule the next download of the home forecast.
+
+        Args:
+            when: time of the next run, defaults to the next prefetch slot
+        """
+        self.cancel_scheduled_event("PrefetchHome")
+        if not self.settings.get("prefetch_home", True):
+            return
+        self.schedule_event(self._prefetch_home,
+                            when or self.prefetch.next_run(now_local()),
+                            name="PrefetchHome")
+
+    def _prefetch_home(self, message: Message = None):
+        """Keep the forecast of the configured location warm.
+
+        The download stays cached until the next run, so voice queries and
+        the homescreen for the home location are answered from memory.
+        """
+        if self.prefetch.should_run(now_local()):
+            try:
+                self._run_async(async_refresh_report(
+                    self._get_weather_config(),
+                    PROFILE_STANDARD,
+                    days=MAX_FORECAST_DAYS,
+                    ttl=self.prefetch.ttl,
+                    client=self.weather_client
+                ))
+                self.prefetch.record_result(True)
+            except Exception:
+                LOG.exception("Failed to prefetch the home forecast")
+                self.prefetch.record_result(False)
+        self._schedule_prefetch()
+
+    def _on_user_activity(self, message: Message = None):
+        """Resume prefetching once the device is used again."""
+        self.prefetch.record_activity()
     
     @property
     def date_format(self) -> str:
@@ -475,7 +586,7 @@ class WeatherSkill(OVOSSkill):
             message: Message Bus event information from the intent parser
         """
         intent_data = self._get_intent_data(message)
-        weather = self._get_weather(intent_data)
+        weather = self._get_weather(intent_data, days=MAX_FORECAST_DAYS)
         if weather is not None:
             forecast, timeframe = weather.get_next_precipitation(intent_data)
             intent_data.timeframe = timeframe
@@ -715,7 +826,7 @@ class WeatherSkill(OVOSSkill):
         """
         weather_config = self._get_weather_config(message)
         intent_data = WeatherIntent(message, weather_config)
-        weather = self._get_weather(intent_data)
+        weather = self._get_weather(intent_data, days=days + 1)
         if weather is not None:
             try:
                 forecast = weather.get_forecast_for_multiple_days(days)
@@ -734,7 +845,7 @@ class WeatherSkill(OVOSSkill):
             message: Message Bus event information from the intent parser
         """
         intent_data = self._get_intent_data(message)
-        weather = self._get_weather(intent_data)
+        weather = self._get_weather(intent_data, days=MAX_FORECAST_DAYS)
         if weather is not None:
             forecast = weather.get_weekend_forecast()
             dialogs = self._build_forecast_dialogs(forecast, intent_data)
@@ -769,7 +880,7 @@ class WeatherSkill(OVOSSkill):
         """
         weather_config = self._get_weather_config(message)
         intent_data = WeatherIntent(message, weather_config)
-        weather = self._get_weather(intent_data)
+        weather = self._get_weather(intent_data, days=MAX_FORECAST_DAYS)
         if weather is not None:
             forecast = weather.get_forecast_for_multiple_days(7)
             dialogs = self._build_weekly_condition_dialogs(forecast, intent_data)
@@ -920,6 +1031,8 @@ class WeatherSkill(OVOSSkill):
         except ValueError:
             self.speak_dialog("cant-get-forecast")
         else:
+            if intent_data.location is not None:
+                self._run_async(self._async_resolve_intent(intent_data))
             unit = message.data.get("unit")
             _dt = intent_data.intent_datetime
             
@@ -955,11 +1068,13 @@ class WeatherSkill(OVOSSkill):
 
         return WeatherConfig(cfg)
 
-    def _get_weather(self, intent_data: WeatherIntent) -> WeatherReport:
+    def _get_weather(self, intent_data: WeatherIntent,
+                     days: int = None) -> WeatherReport:
         """Call the Open Weather Map One Call API to get weather information
 
         Args:
             intent_data: Parsed intent data
+            days: daily forecasts needed, defaults to the intent horizon
 
         Returns:
             An object representing the data returned by the API
@@ -967,7 +1082,14 @@ class WeatherSkill(OVOSSkill):
         weather = None
         if intent_data is not None:
             try:
-                weather = get_report(intent_data.config)
+                hours, intent_days = intent_data.forecast_horizon
+                weather = self._run_async(async_get_report(
+                    intent_data.config,
+                    get_profile(intent_data.timeframe),
+                    hours=hours,
+                    days=days or intent_days,
+                    client=self.weather_client
+                ))
             except HTTPError as api_error:
                 LOG.exception("Weather API failure")
                 self._handle_api_error(api_error)
@@ -982,6 +1104,39 @@ class WeatherSkill(OVOSSkill):
 
         return weather
 
+    async def _async_resolve_intent(self, intent_data: WeatherIntent):
+        """Look up the location of an intent while its forecast downloads.
+
+        The forecast is for the configured location, which the lookup
+        doesn't change.  Its horizon is estimated in the configured
+        timezone, so the handler finds the forecast it needs in the cache.
+        Errors are left to be raised again, and reported, when the skill
+        reads the values.
+
+        Args:
+            intent_data: Parsed intent data naming a location
+        """
+        loop = asyncio.get_running_loop()
+        hours, days = intent_data.configured_horizon
+        await asyncio.gather(
+            loop.run_in_executor(None, lambda: intent_data.intent_datetime),
+            async_get_report(intent_data.config, PROFILE_STANDARD,
+                             hours=hours, days=days,
+                             client=self.weather_client),
+            return_exceptions=True
+        )
+
+    def _run_async(self, coroutine):
+        """Run a coroutine on the skill event loop and wait for its result.
+
+        Args:
+            coroutine: the coroutine to run
+
+        Returns:
+            the result of the coroutine
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.event_loop).result()
+
     def _handle_api_error(self, exception: HTTPError):
         """Communicate an error condition to the user.
 
@@ -1059,9 +1214,13 @@ class WeatherSkill(OVOSSkill):
                 system_unit: whether the report uses metric or imperial
             }
         """
+        self.prefetch.record_activity()
         try:
             weather_config = self._get_weather_config(message=message)
-            weather = get_report(weather_config)
+            weather = self._run_async(async_get_report(
+                weather_config, PROFILE_MINIMAL, hours=1, days=1,
+                client=self.weather_client
+            ))
 
             result = dict(
                 weather_temp=weather.current.temperature,
@@ -1083,3 +1242,13 @@ class WeatherSkill(OVOSSkill):
 
     def stop(self):
         self.gui.release()
+
+    def shutdown(self):
+        # nothing may write to the store once it is closed
+        self._run_async(cancel_refreshes())
+        self.event_loop.call_soon_threadsafe(self.event_loop.stop)
+        self._loop_thread.join()
+        self.event_loop.close()
+        self.weather_client.close()
+        set_forecast_store(None)
+        self.forecast_store.close()
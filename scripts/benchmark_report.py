@@ -0,0 +1,133 @@
+"""Time the construction of a WeatherReport from a full seven day forecast.
+
+"baseline" is the construction before the columnar tables, a copy of the
+old loop building a dict and a Weather for every hourly and daily row.
+"all rows" reads every row of the current report and "lazy" the rows a
+current weather intent and the homescreen use.
+"""
+import timeit
+from datetime import datetime, timedelta
+
+from skill_ovos_weather.weather_helpers.openmeteo import (
+    PROFILE_FULL,
+    PROFILE_PARAMS,
+    MAX_FORECAST_DAYS
+)
+from skill_ovos_weather.weather_helpers.util import convert_to_local_datetime
+from skill_ovos_weather.weather_helpers.weather import (
+    WIND_DIRECTION_CONVERSION,
+    WeatherCondition,
+    WeatherReport
+)
+
+RUNS = 200
+
+
+def make_payload() -> dict:
+    hourly_params, daily_params = PROFILE_PARAMS[PROFILE_FULL]
+    start = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    hours = [(start + timedelta(hours=idx)).strftime("%Y-%m-%dT%H:%M")
+             for idx in range(MAX_FORECAST_DAYS * 24)]
+    days = [(start + timedelta(days=idx)).strftime("%Y-%m-%d")
+            for idx in range(MAX_FORECAST_DAYS)]
+    hourly = {"time": hours}
+    hourly.update({param: [(idx % 7) * 1.5 for idx in range(len(hours))]
+                   for param in hourly_params})
+    hourly["weathercode"] = [(0, 1, 2, 3, 61)[idx % 5]
+                             for idx in range(len(hours))]
+    daily = {"time": days}
+    daily.update({param: [10.5] * len(days) for param in daily_params})
+    daily["weathercode"] = [3] * len(days)
+    daily["sunrise"] = [f"{day}T06:00" for day in days]
+    daily["sunset"] = [f"{day}T20:00" for day in days]
+    units = {"temperature_2m": "°C", "windspeed_10m": "m/s",
+             "precipitation": "mm"}
+    return {"timezone": "UTC",
+            "current_weather": {"time": hours[0], "temperature": 12.0},
+            "hourly": hourly,
+            "hourly_units": {param: units.get(param, "") for param in hourly},
+            "daily": daily,
+            "daily_units": {param: "" for param in daily}}
+
+
+class BaselineWeather:
+    """Weather.__init__ as it was when every row was built up front.
+
+    The conditions are the interned WeatherCondition of today, the old
+    one mapped the code with the same comparisons.
+    """
+
+    def __init__(self, weather: dict, timezone: str, units: dict):
+        self.date_time = convert_to_local_datetime(weather["time"], timezone)
+        self.units = units
+        self.pressure = weather.get("surface_pressure")
+        self.humidity = weather.get("relativehumidity_2m") or \
+            weather.get("relativehumidity_1000hPa")
+        self.dew_point = weather.get("dewpoint_2m")
+        self.clouds = weather.get("cloudcover")
+        self.wind_speed = weather.get("windspeed_10m")
+        self.wind_speed_max = weather.get("windspeed_10m_max") or \
+            self.wind_speed
+        self.wind_direction = weather.get("winddirection_10m") or \
+            weather.get("winddirection_10m_dominant")
+        if self.wind_direction:
+            for min_degree, direction in WIND_DIRECTION_CONVERSION:
+                if self.wind_direction < min_degree:
+                    self.wind_direction = direction
+                    break
+            else:
+                self.wind_direction = "north"
+        self.sunrise = weather.get("sunrise")
+        if self.sunrise and isinstance(self.sunrise, str):
+            self.sunrise = convert_to_local_datetime(self.sunrise, timezone)
+        self.sunset = weather.get("sunset")
+        if self.sunset and isinstance(self.sunset, str):
+            self.sunset = convert_to_local_datetime(self.sunset, timezone)
+        self.temperature = weather.get("temperature_2m")
+        self.visibility = weather.get("visibility")
+        self.temperature_low = weather.get("temperature_2m_min") or \
+            self.temperature
+        self.temperature_high = weather.get("temperature_2m_max") or \
+            self.temperature
+        self.chance_of_precipitation = \
+            weather.get("precipitation_probability_mean") or \
+            weather.get("precipitation_probability_max") or \
+            weather.get("precipitation_probability_min") or \
+            weather.get("precipitation_probability") or 0
+        self.precipitation = weather.get("precipitation_sum") or \
+            weather.get("precipitation")
+        self.uvindex = weather.get("uv_index_max") or \
+            int(weather.get("shortwave_radiation") * 3.6 / 27.8)
+        self.condition = WeatherCondition(weather["weathercode"])
+
+
+def baseline(payload: dict, scale: str):
+    # units were converted by the api, the scale changed nothing
+    timezone = payload["timezone"]
+    for block in ("hourly", "daily"):
+        series, units = payload[block], payload[f"{block}_units"]
+        for idx in range(len(series["time"])):
+            BaselineWeather({key: values[idx] for key, values in series.items()},
+                            timezone, units)
+
+
+def all_rows(payload: dict, scale: str):
+    report = WeatherReport(payload, scale)
+    list(report.hourly)
+    list(report.daily)
+
+
+def lazy(payload: dict, scale: str):
+    report = WeatherReport(payload, scale)
+    report.current
+    report.daily[0]
+
+
+if __name__ == "__main__":
+    payload = make_payload()
+    for scale in ("metric", "imperial"):
+        for name, build in (("baseline", baseline), ("all rows", all_rows),
+                            ("lazy", lazy)):
+            seconds = min(timeit.repeat(lambda: build(payload, scale),
+                                        number=RUNS, repeat=3)) / RUNS
+            print(f"{scale:8} {name:8} {seconds * 1000:7.3f} ms per report")
@@ -0,0 +1,37 @@
+from skill_ovos_weather.weather_helpers.openmeteo import (
+    PROFILE_PARAMS,
+    PROFILE_STANDARD
+)
+
+
+def make_payload(profile=PROFILE_STANDARD, days=2, hourly=lambda idx: 1,
+                 daily=lambda idx: 1):
+    """Build an Open-Meteo response in UTC covering 2023-08-16 onward.
+
+    Args:
+        profile: the parameter profile of the variables in the response
+        days: the days of hourly and daily forecasts
+        hourly: the value of every hourly variable for a row index
+        daily: the value of every daily variable for a row index
+
+    Returns:
+        the decoded json response
+    """
+    hourly_params, daily_params = PROFILE_PARAMS[profile]
+    hours = [f"2023-08-{16 + day}T{hour:02d}:00"
+             for day in range(days) for hour in range(24)]
+    dates = [f"2023-08-{16 + day}" for day in range(days)]
+    hourly_block = {"time": hours}
+    hourly_block.update({param: [hourly(idx) for idx in range(len(hours))]
+                         for param in hourly_params})
+    daily_block = {"time": dates}
+    daily_block.update({param: [daily(idx) for idx in range(len(dates))]
+                        for param in daily_params})
+    daily_block["sunrise"] = [f"{date}T06:00" for date in dates]
+    daily_block["sunset"] = [f"{date}T20:00" for date in dates]
+    return {"timezone": "UTC", "utc_offset_seconds": 0,
+            "current_weather": {"time": hours[0]},
+            "hourly": hourly_block,
+            "hourly_units": {param: "" for param in hourly_block},
+            "daily": daily_block,
+            "daily_units": {param: "" for param in daily_block}}
@@ -0,0 +1,205 @@
+import unittest
+from fnmatch import fnmatchcase
+from os.path import join
+from tempfile import TemporaryDirectory
+from time import monotonic
+from unittest.mock import Mock, patch
+
+from skill_ovos_weather.weather_helpers import util
+from skill_ovos_weather.weather_helpers.backends import (
+    BACKEND_REDIS,
+    DEFAULT_REDIS_TIMEOUT,
+    CacheBackend,
+    MemoryBackend,
+    RedisBackend,
+    SQLiteBackend,
+    create_backend
+)
+from skill_ovos_weather.weather_helpers.store import BackendForecastStore
+
+
+class FakeRedis:
+    """The part of the redis-py client the backend uses, in memory."""
+
+    def __init__(self):
+        self.values = {}
+
+    def _live(self, key):
+        entry = self.values.get(key)
+        if entry and entry[1] is not None and entry[1] <= monotonic():
+            del self.values[key]
+            return None
+        return entry
+
+    def get(self, key):
+        entry = self._live(key.encode())
+        return entry and entry[0]
+
+    def set(self, key, value, px=None):
+        expires_at = None if px is None else monotonic() + px / 1000
+        self.values[key.encode()] = (value, expires_at)
+
+    def pttl(self, key):
+        entry = self._live(key.encode())
+        if entry is None:
+            return -2
+        if entry[1] is None:
+            return -1
+        return int((entry[1] - monotonic()) * 1000)
+
+    def delete(self, *keys):
+        for key in keys:
+            self.values.pop(key.encode(), None)
+
+    def mget(self, keys):
+        return [self.get(key) for key in keys]
+
+    def scan_iter(self, match):
+        return [key for key in list(self.values)
+                if self._live(key) and fnmatchcase(key.decode(), match)]
+
+    def pipeline(self):
+        return FakePipeline(self)
+
+    def ping(self):
+        return True
+
+    def close(self):
+        pass
+
+
+class FakePipeline:
+    """Queue the commands of a FakeRedis until execute."""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def __getattr__(self, name):
+        command = getattr(self.client, name)
+        return lambda *args, **kwargs: self.commands.append(
+            (command, args, kwargs))
+
+    def execute(self):
+        return [command(*args, **kwargs)
+                for command, args, kwargs in self.commands]
+
+
+class BackendContract:
+    def make_backend(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.backend = self.make_backend()
+
+    def tearDown(self):
+        self.backend.close()
+
+    def test_get_set_delete(self):
+        self.assertIsNone(self.backend.get("forecast:a"))
+        self.backend.set("forecast:a", b"1", ttl=60)
+        self.assertEqual(self.backend.get("forecast:a"), b"1")
+        self.assertAlmostEqual(self.backend.ttl("forecast:a"), 60, delta=1)
+        self.backend.delete("forecast:a")
+        self.assertIsNone(self.backend.get("forecast:a"))
+        self.assertIsNone(self.backend.ttl("forecast:a"))
+
+    def test_expiry(self):
+        self.backend.set("forecast:a", b"1", ttl=-1)
+        self.backend.set("forecast:b", b"2")
+        self.assertIsNone(self.backend.get("forecast:a"))
+        self.assertIsNone(self.backend.ttl("forecast:b"))
+        self.assertEqual(self.backend.scan("forecast:"), ["forecast:b"])
+
+    def test_bulk(self):
+        self.backend.set_many({"forecast:a": b"1", "forecast:b": b"2",
+                               "geolocation:a": b"3"}, ttl=60)
+        self.assertEqual(sorted(self.backend.scan("forecast:")),
+                         ["forecast:a", "forecast:b"])
+        self.assertEqual(self.backend.get_many(["forecast:a", "forecast:c"]),
+                         {"forecast:a": b"1"})
+        self.backend.delete_many(["forecast:a", "forecast:b"])
+        self.assertEqual(self.backend.scan("forecast:"), [])
+        self.assertEqual(self.backend.get("geolocation:a"), b"3")
+
+    def test_ttl_many(self):
+        self.backend.set("forecast:a", b"1", ttl=60)
+        self.backend.set("forecast:b", b"2")
+        self.backend.set("forecast:c", b"3", ttl=-1)
+        ttls = self.backend.ttl_many(["forecast:a", "forecast:b",
+                                      "forecast:c", "forecast:d"])
+        self.assertEqual(sorted(ttls), ["forecast:a", "forecast:b"])
+        self.assertAlmostEqual(ttls["forecast:a"], 60, delta=1)
+        self.assertIsNone(ttls["forecast:b"])
+
+    def test_forecast_store(self):
+        store = BackendForecastStore(self.backend, max_age=60, max_entries=2)
+        for idx in range(3):
+            store.put((idx, "UTC"), {"idx": idx}, fetched_at=1e10 + idx)
+        self.assertEqual(store.get((2, "UTC")), ({"idx": 2}, 1e10 + 2))
+        self.assertEqual([key for key, _, _ in store.entries()],
+                         [(2, "UTC"), (1, "UTC")])
+        self.assertEqual([key for key, _, _ in store.entries(limit=1)],
+                         [(2, "UTC")])
+
+    def test_prune_does_not_decode_payloads(self):
+        store = BackendForecastStore(self.backend, max_age=60, max_entries=1)
+        with patch.object(store, "_decode") as decode:
+            for idx in range(3):
+                store.put((idx, "UTC"), {"idx": idx}, fetched_at=1e10 + idx)
+        decode.assert_not_called()
+        self.assertEqual(self.backend.scan(store.namespace),
+                         [store._key((2, "UTC"))])
+
+
+class TestMemoryBackend(BackendContract, unittest.TestCase):
+    def make_backend(self):
+        return MemoryBackend()
+
+
+class TestSQLiteBackend(BackendContract, unittest.TestCase):
+    def make_backend(self):
+        self.tmp = TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        return SQLiteBackend(join(self.tmp.name, "cache.db"))
+
+
+class TestRedisBackend(BackendContract, unittest.TestCase):
+    def make_backend(self):
+        return RedisBackend(client=FakeRedis(), prefix="test:")
+
+
+class TestInterface(unittest.TestCase):
+    def test_incomplete_backend_can_not_be_created(self):
+        class GetOnly(CacheBackend):
+            def get(self, key):
+                return None
+
+        with self.assertRaises(TypeError):
+            GetOnly()
+
+
+class TestCreateBackend(unittest.TestCase):
+    def test_unreachable_redis_falls_back_to_memory(self):
+        redis = Mock()
+        redis.Redis.from_url.return_value.ping.side_effect = ConnectionError
+        with patch.dict("sys.modules", redis=redis):
+            backend = create_backend(BACKEND_REDIS, url="redis://nowhere")
+        self.assertIsInstance(backend, MemoryBackend)
+        redis.Redis.from_url.assert_called_once_with(
+            "redis://nowhere", socket_connect_timeout=DEFAULT_REDIS_TIMEOUT,
+            socket_timeout=DEFAULT_REDIS_TIMEOUT)
+
+
+class TestGeolocationCache(unittest.TestCase):
+    def tearDown(self):
+        util.set_geolocation_cache(MemoryBackend())
+
+    def test_lookups_are_cached(self):
+        util.set_geolocation_cache(MemoryBackend())
+        place = {"city": "Berlin", "latitude": 52.52, "longitude": 13.4}
+        with patch.object(util, "_lookup_geolocation",
+                          return_value=place) as lookup:
+            self.assertEqual(util.get_geolocation("Berlin"), place)
+            self.assertEqual(util.get_geolocation(" berlin"), place)
+        lookup.assert_called_once_with("Berlin")
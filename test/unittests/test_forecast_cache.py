@@ -0,0 +1,148 @@
+import asyncio
+import unittest
+from threading import Event, Thread, Timer
+from time import sleep
+from unittest.mock import patch
+
+from skill_ovos_weather.weather_helpers import cache
+from skill_ovos_weather.weather_helpers.cache import ForecastCache, SingleFlight
+
+
+class TestForecastCache(unittest.TestCase):
+    def test_get_put(self):
+        forecasts = ForecastCache(ttl=60, max_entries=4)
+        self.assertIsNone(forecasts.get("home"))
+        forecasts.put("home", "report")
+        self.assertEqual(forecasts.get("home"), "report")
+        self.assertIn("home", forecasts)
+
+    def test_ttl(self):
+        forecasts = ForecastCache(ttl=60, max_entries=4)
+        with patch.object(cache, "monotonic", return_value=100):
+            forecasts.put("home", "report")
+        with patch.object(cache, "monotonic", return_value=159):
+            self.assertEqual(forecasts.get("home"), "report")
+        with patch.object(cache, "monotonic", return_value=160):
+            self.assertIsNone(forecasts.get("home"))
+        self.assertEqual(len(forecasts), 0)
+
+    def test_lru_eviction(self):
+        forecasts = ForecastCache(ttl=60, max_entries=2)
+        forecasts.put("a", 1)
+        forecasts.put("b", 2)
+        forecasts.get("a")
+        forecasts.put("c", 3)
+        self.assertIsNone(forecasts.get("b"))
+        self.assertEqual(forecasts.get("a"), 1)
+        self.assertEqual(forecasts.get("c"), 3)
+
+    def test_configure(self):
+        forecasts = ForecastCache(ttl=60, max_entries=3)
+        for key in "abc":
+            forecasts.put(key, key)
+        forecasts.configure(ttl="120", max_entries="1")
+        self.assertEqual(forecasts.ttl, 120)
+        self.assertEqual(len(forecasts), 1)
+        self.assertEqual(forecasts.get("c"), "c")
+
+    def test_grace(self):
+        forecasts = ForecastCache(ttl=60, max_entries=4, grace=30)
+        with patch.object(cache, "monotonic", return_value=100):
+            forecasts.put("home", "report")
+        with patch.object(cache, "monotonic", return_value=170):
+            self.assertIsNone(forecasts.get("home"))
+            self.assertEqual(forecasts.get_stale("home"), ("report", True))
+        with patch.object(cache, "monotonic", return_value=190):
+            self.assertEqual(forecasts.get_stale("home"), (None, False))
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_calls_share_one_execution(self):
+        flights = SingleFlight()
+        release = Event()
+        executions = []
+
+        def fetch():
+            executions.append(1)
+            release.wait(5)
+            return "forecast"
+
+        results = []
+        threads = [Thread(target=lambda: results.append(
+            flights.do("home", fetch))) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        while flights.calls < 4:
+            sleep(0.01)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+        self.assertEqual(len(executions), 1)
+        self.assertEqual(flights.deduplicated, 3)
+        self.assertEqual(sorted(shared for _, shared in results),
+                         [False, True, True, True])
+        self.assertTrue(all(result == "forecast" for result, _ in results))
+
+    def test_errors_are_shared_and_not_cached(self):
+        flights = SingleFlight()
+
+        def fail():
+            raise RuntimeError("upstream")
+
+        with self.assertRaises(RuntimeError):
+            flights.do("home", fail)
+        self.assertEqual(flights.do("home", lambda: "forecast"),
+                         ("forecast", False))
+
+    def test_many_keys_join_flights_in_progress(self):
+        flights = SingleFlight()
+        release = Event()
+        batches = []
+
+        def fetch(keys):
+            batches.append(keys)
+            release.wait(5)
+            return {key: key.upper() for key in keys}
+
+        single = Thread(target=flights.do, args=("home", lambda: fetch(
+            ["home"])["home"]))
+        single.start()
+        while not flights.in_flight("home"):
+            sleep(0.01)
+        Timer(0.05, release.set).start()
+        results, shared = flights.do_many(["home", "work"], fetch)
+        single.join(5)
+        self.assertEqual(batches, [["home"], ["work"]])
+        self.assertEqual(results, {"home": "HOME", "work": "WORK"})
+        self.assertEqual(shared, {"home"})
+        self.assertEqual(flights.deduplicated, 1)
+
+    def test_many_keys_share_errors(self):
+        flights = SingleFlight()
+
+        def fail(keys):
+            raise RuntimeError("upstream")
+
+        with self.assertRaises(RuntimeError):
+            flights.do_many(["home", "work"], fail)
+        self.assertFalse(flights.in_flight("home"))
+        self.assertEqual(flights.do_many(["home"], lambda keys: {}),
+                         ({}, set()))
+        self.assertFalse(flights.in_flight("home"))
+
+    def test_async_followers(self):
+        flights = SingleFlight()
+        executions = []
+
+        async def fetch():
+            executions.append(1)
+            await asyncio.sleep(0.01)
+            return "forecast"
+
+        async def main():
+            return await asyncio.gather(
+                *(flights.async_do("home", fetch) for _ in range(3)))
+
+        results = asyncio.run(main())
+        self.assertEqual(len(executions), 1)
+        self.assertEqual([result for result, _ in results], ["forecast"] * 3)
@@ -0,0 +1,91 @@
+import os
+import unittest
+from tempfile import TemporaryDirectory
+from time import time
+
+from skill_ovos_weather.weather_helpers.store import (
+    ForecastStore,
+    SQLiteForecastStore
+)
+
+
+class TestForecastStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.store = ForecastStore(self.tmp.name, max_age=60, max_entries=2)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_put_get(self):
+        key = (52.52, 13.41, "Europe/Berlin")
+        self.assertIsNone(self.store.get(key))
+        self.store.put(key, {"timezone": "Europe/Berlin"}, fetched_at=time())
+        payload, fetched_at = self.store.get(key)
+        self.assertEqual(payload, {"timezone": "Europe/Berlin"})
+        self.assertEqual(self.store.entries()[0][0], key)
+        self.assertFalse([name for name in os.listdir(self.tmp.name)
+                          if name.endswith(".tmp")])
+
+    def test_expiry(self):
+        key = (52.52, 13.41, "Europe/Berlin")
+        self.store.put(key, {}, fetched_at=time() - 61)
+        self.assertIsNone(self.store.get(key))
+        self.assertEqual(os.listdir(self.tmp.name), [])
+
+    def test_size_cap(self):
+        for idx in range(3):
+            self.store.put((idx, idx, "UTC"), {"idx": idx})
+        self.assertEqual(len(self.store.entries()), 2)
+
+    def test_corrupt_file(self):
+        key = (52.52, 13.41, "Europe/Berlin")
+        self.store.put(key, {})
+        with open(self.store._file_for(key), "w") as f:
+            f.write("{")
+        self.assertIsNone(self.store.get(key))
+
+
+class TestSQLiteForecastStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "forecasts.db")
+        self.store = SQLiteForecastStore(self.path, max_age=60,
+                                         max_entries=2)
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_shared_between_instances(self):
+        key = (52.52, 13.41, "Europe/Berlin")
+        other = SQLiteForecastStore(self.path, max_age=60, max_entries=2)
+        self.assertIsNone(other.get(key))
+        self.store.put(key, {"timezone": "Europe/Berlin"}, fetched_at=1e10)
+        self.assertEqual(other.get(key), ({"timezone": "Europe/Berlin"}, 1e10))
+        self.assertEqual(other.entries()[0][0], key)
+        other.close()
+
+    def test_wal_and_compression(self):
+        conn = self.store.backend._conn
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+        self.store.put(("a",), {"temperature_2m": [1.5] * 1000})
+        size = conn.execute("SELECT length(value) FROM cache").fetchone()[0]
+        self.assertLess(size, 200)
+
+    def test_expiry_and_size_cap(self):
+        self.store.put(("old",), {}, fetched_at=time() - 61)
+        self.assertIsNone(self.store.get(("old",)))
+        for idx in range(3):
+            self.store.put((idx,), {"idx": idx}, fetched_at=time() + idx)
+        self.assertEqual(sorted(key for key, _, _ in self.store.entries()),
+                         [(1,), (2,)])
+
+    def test_corrupt_payload(self):
+        key = (52.52, 13.41, "Europe/Berlin")
+        self.store.put(key, {})
+        with self.store.backend._conn as conn:
+            conn.execute("UPDATE cache SET value = ?", (b"{",))
+        self.assertIsNone(self.store.get(key))
+        self.assertEqual(self.store.entries(), [])
@@ -0,0 +1,426 @@
+import asyncio
+import unittest
+from datetime import datetime
+from threading import Event, Thread, Timer
+from time import sleep, time
+from unittest.mock import Mock, patch
+
+import pytz
+
+from skill_ovos_weather.weather_helpers import openmeteo
+from skill_ovos_weather.weather_helpers.openmeteo import (
+    CachedForecast,
+    OpenMeteoClient,
+    PROFILE_FULL,
+    PROFILE_MINIMAL,
+    PROFILE_PARAMS,
+    PROFILE_STANDARD,
+    async_get_report,
+    get_profile,
+    get_report,
+    get_reports
+)
+from skill_ovos_weather.weather_helpers.weather import (
+    CURRENT,
+    DAILY,
+    HOURLY,
+    WeatherCondition
+)
+
+from . import make_payload
+
+# the fixtures cover 2023-08-16 onward, pin the clock in their first hours
+NOW = pytz.utc.localize(datetime(2023, 8, 16, 5, 30))
+clock = patch("skill_ovos_weather.weather_helpers.weather.now_local",
+              lambda tz=None: NOW.astimezone(tz))
+
+
+def setUpModule():
+    clock.start()
+
+
+def tearDownModule():
+    clock.stop()
+
+
+def make_client(delay=0):
+    """A mocked client, its coroutine calls the mocked get_forecast."""
+    client = Mock()
+
+    async def async_get_forecast(params):
+        await asyncio.sleep(delay)
+        return client.get_forecast(params)
+
+    client.async_get_forecast = async_get_forecast
+    return client
+
+
+class TestProfiles(unittest.TestCase):
+    def test_get_profile(self):
+        self.assertEqual(get_profile(CURRENT), PROFILE_MINIMAL)
+        self.assertEqual(get_profile(HOURLY), PROFILE_STANDARD)
+        self.assertEqual(get_profile(DAILY), PROFILE_STANDARD)
+
+    def test_profiles_are_supersets(self):
+        for smaller, larger in zip(openmeteo.PROFILES, openmeteo.PROFILES[1:]):
+            for small, large in zip(PROFILE_PARAMS[smaller], PROFILE_PARAMS[larger]):
+                self.assertTrue(set(small) <= set(large))
+
+    def test_covers(self):
+        forecast = CachedForecast(make_payload(PROFILE_STANDARD))
+        self.assertEqual(forecast.profile, PROFILE_STANDARD)
+        self.assertTrue(forecast.covers(PROFILE_MINIMAL, 1, 1))
+        self.assertTrue(forecast.covers(PROFILE_STANDARD, 1, 1))
+        self.assertFalse(forecast.covers(PROFILE_FULL, 1, 1))
+        forecast = CachedForecast(make_payload(PROFILE_MINIMAL))
+        self.assertFalse(forecast.covers(PROFILE_STANDARD, 1, 1))
+
+
+class TestHorizon(unittest.TestCase):
+    def test_horizon_starts_at_current_hour(self):
+        payload = make_payload(days=2)
+        payload["hourly"]["temperature_2m"] = list(range(48))
+        forecast = CachedForecast(payload)
+        self.assertEqual(len(forecast.payload["hourly"]["time"]), 48)
+        self.assertEqual(forecast.report("metric").hourly[0].temperature, 5)
+        self.assertEqual(forecast.hours, 43)
+        self.assertEqual(forecast.days, 2)
+        self.assertTrue(forecast.covers(PROFILE_MINIMAL, 43, 2))
+        self.assertFalse(forecast.covers(PROFILE_MINIMAL, 44, 2))
+        self.assertFalse(forecast.covers(PROFILE_MINIMAL, 1, 3))
+
+    def test_daily_humidity_of_trimmed_horizon(self):
+        payload = make_payload(days=2)
+        for param, series in payload["hourly"].items():
+            payload["hourly"][param] = series[20:30]
+        payload["hourly"]["relativehumidity_2m"] = [50] * 4 + [70] * 6
+        forecast = CachedForecast(payload)
+        self.assertEqual(forecast.payload["daily"]["relativehumidity_2m"],
+                         [50, 70])
+
+    def test_horizon_shrinks_past_midnight(self):
+        global NOW
+        previous = NOW
+        try:
+            NOW = pytz.utc.localize(datetime(2023, 8, 16, 23, 50))
+            forecast = CachedForecast(make_payload(days=1))
+            self.assertEqual((forecast.hours, forecast.days), (1, 1))
+            self.assertTrue(forecast.covers(PROFILE_MINIMAL, 1, 1))
+            NOW = pytz.utc.localize(datetime(2023, 8, 17, 0, 5))
+            self.assertEqual((forecast.hours, forecast.days), (0, 0))
+            self.assertFalse(forecast.covers(PROFILE_MINIMAL, 1, 1))
+        finally:
+            NOW = previous
+
+    def test_daily_rollups(self):
+        payload = make_payload(days=2)
+        # downloaded at 01:00, the rollups of today cover the rest of it
+        for param, series in payload["hourly"].items():
+            payload["hourly"][param] = series[1:]
+        payload["hourly"]["cloudcover"] = [10, 30] + [20] * 21 + [0] * 24
+        payload["hourly"]["dewpoint_2m"] = [5.0] * 23 + [2.0] * 23 + [None]
+        payload["hourly_units"]["dewpoint_2m"] = "°C"
+        with patch.dict(openmeteo.DAILY_ROLLUPS,
+                        {"cloudcover": ("min", "max", "mean", "sum")}):
+            forecast = CachedForecast(payload)
+        daily = forecast.payload["daily"]
+        self.assertEqual(daily["cloudcover_min"], [10, 0])
+        self.assertEqual(daily["cloudcover_max"], [30, 0])
+        self.assertEqual(daily["cloudcover_sum"], [460, 0])
+        self.assertEqual(daily["cloudcover_mean"], [20, 0])
+        self.assertEqual(daily["dewpoint_2m_mean"], [5.0, 2.0])
+        self.assertEqual(forecast.payload["daily_units"]["dewpoint_2m_max"],
+                         "°C")
+        today = forecast.report("imperial").daily[0]
+        self.assertEqual(today.clouds, 20)
+        self.assertEqual(today.dew_point, 41.0)
+
+    def test_days_past_the_hourly_forecast(self):
+        payload = make_payload(days=3)
+        for param, series in payload["hourly"].items():
+            payload["hourly"][param] = series[:48]
+        daily = CachedForecast(payload).payload["daily"]
+        self.assertEqual(daily["cloudcover_mean"], [1, 1, None])
+        self.assertEqual(daily["relativehumidity_2m"], [1, 1, None])
+
+    def test_daily_humidity_skips_missing_values(self):
+        payload = make_payload(days=2)
+        payload["hourly"]["relativehumidity_2m"] = [None] * 24 + [60] * 24
+        payload["hourly"]["relativehumidity_2m"][30] = None
+        forecast = CachedForecast(payload)
+        self.assertEqual(forecast.payload["daily"]["relativehumidity_2m"],
+                         [None, 60])
+
+    def test_hour_rollover_needs_no_refetch(self):
+        global NOW
+        payload = make_payload(days=2)
+        payload["current_weather"].update(time="2023-08-16T05:15",
+                                          weathercode=3)
+        payload["hourly"]["temperature_2m"] = list(range(48))
+        payload["daily"]["temperature_2m_max"] = [16, 17]
+        report = CachedForecast(payload).report("metric")
+        hourly = report.hourly
+        self.assertEqual(report.current.date_time.minute, 15)
+        self.assertEqual(report.current.condition.code,
+                         WeatherCondition(3).code)
+        previous = NOW
+        try:
+            NOW = pytz.utc.localize(datetime(2023, 8, 17, 1, 10))
+            self.assertIs(report.hourly[0], hourly[20])
+            self.assertEqual(report.hourly[0].temperature, 25)
+            self.assertIs(report.current, hourly[20])
+            self.assertEqual(report.daily[0].temperature_high, 17)
+        finally:
+            NOW = previous
+
+
+class TestGridSnapping(unittest.TestCase):
+    def tearDown(self):
+        openmeteo.set_grid_resolution(0.02)
+
+    def test_nearby_coordinates_share_a_key(self):
+        town = Mock(latitude=52.520008, longitude=13.404954, timezone="UTC")
+        geolocated = Mock(latitude=52.5244, longitude=13.4089, timezone="UTC")
+        self.assertEqual(openmeteo.get_cache_key(town),
+                         openmeteo.get_cache_key(geolocated))
+        self.assertEqual(openmeteo.get_grid_point(town), (52.52, 13.4))
+        params = openmeteo.get_forecast_params(geolocated)
+        self.assertEqual((params["latitude"], params["longitude"]),
+                         (52.52, 13.4))
+
+    def test_disabled(self):
+        openmeteo.set_grid_resolution(0)
+        town = Mock(latitude=52.520008, longitude=13.404954, timezone="UTC")
+        self.assertEqual(openmeteo.get_grid_point(town), (52.52, 13.405))
+
+
+class TestStaleWhileRevalidate(unittest.TestCase):
+    def setUp(self):
+        self.cfg = Mock(latitude=52.52, longitude=13.41, timezone="UTC",
+                        scale="metric")
+        self.key = openmeteo.get_cache_key(self.cfg)
+        self.client = make_client()
+        self.client.get_forecast.return_value = make_payload()
+
+    def tearDown(self):
+        openmeteo.FORECAST_CACHE.clear()
+
+    def test_stale_forecast_is_served_and_refreshed(self):
+        stale = CachedForecast(make_payload())
+        cache = openmeteo.FORECAST_CACHE
+        cache.put(self.key, stale, age=cache.ttl + 1)
+        report = get_report(self.cfg, PROFILE_MINIMAL, 1, 1, self.client)
+        self.assertIs(report, stale.report("metric"))
+        for _ in range(100):
+            if cache.get(self.key) is not None:
+                break
+            sleep(0.01)
+        self.assertIsNot(cache.get(self.key), stale)
+        self.client.get_forecast.assert_called_once()
+
+    def test_stored_copy_does_not_replace_stale_forecast(self):
+        cache = openmeteo.FORECAST_CACHE
+        fetched_at = time() - cache.ttl - 1
+        stale = CachedForecast(make_payload(), fetched_at)
+        cache.put(self.key, stale, age=cache.ttl + 1)
+        store = Mock()
+        store.get.return_value = (make_payload(), fetched_at)
+        openmeteo.set_forecast_store(store)
+        self.addCleanup(openmeteo.set_forecast_store, None)
+        async def no_refresh(key, fetch):
+            pass
+
+        with patch.object(openmeteo, "_async_refresh_forecast", no_refresh):
+            reports = [get_report(self.cfg, PROFILE_MINIMAL, 1, 1,
+                                  self.client) for _ in range(3)]
+            self.assertTrue(all(report is stale.report("metric")
+                                for report in reports))
+            # a newer download from another process does replace it
+            store.get.return_value = (make_payload(), fetched_at + 60)
+            get_report(self.cfg, PROFILE_MINIMAL, 1, 1, self.client)
+        self.assertEqual(cache.get_stale(self.key)[0].fetched_at,
+                         fetched_at + 60)
+
+    def test_load_forecast_store_restores_most_recent(self):
+        cache = openmeteo.FORECAST_CACHE
+        now = time()
+        store = Mock()
+        store.entries.return_value = [((idx, "UTC"), make_payload(), now - idx)
+                                      for idx in range(cache.max_entries)]
+        openmeteo.set_forecast_store(store)
+        self.addCleanup(openmeteo.set_forecast_store, None)
+        self.assertEqual(openmeteo.load_forecast_store(), cache.max_entries)
+        store.entries.assert_called_once_with(cache.max_entries)
+        # the most recent download is the last one evicted
+        cache.put(("other", "UTC"), CachedForecast(make_payload()))
+        self.assertIsNone(cache.get((cache.max_entries - 1, "UTC")))
+        self.assertIsNotNone(cache.get((0, "UTC")))
+
+    def test_expired_forecast_is_fetched(self):
+        cache = openmeteo.FORECAST_CACHE
+        cache.put(self.key, CachedForecast(make_payload()),
+                  age=cache.ttl + cache.grace)
+        get_report(self.cfg, PROFILE_MINIMAL, 1, 1, self.client)
+        self.client.get_forecast.assert_called_once()
+
+
+class TestOpenMeteoClient(unittest.TestCase):
+    def test_pooled_session(self):
+        client = OpenMeteoClient(connect_timeout=1, read_timeout=2)
+        self.assertIs(client.session.get_adapter(client.url), client.adapter)
+        self.assertIn("gzip", client.session.headers["Accept-Encoding"])
+        response = Mock(content=b'{"timezone": "UTC"}')
+        with patch.object(client.session, "get",
+                          return_value=response) as get:
+            self.assertEqual(client.get_forecast({"latitude": 1}),
+                             {"timezone": "UTC"})
+            get.assert_called_once_with(client.url, params={"latitude": 1},
+                                        timeout=(1, 2))
+        response.raise_for_status.assert_called_once()
+        client.close()
+
+    def test_decoder(self):
+        decoder = Mock(return_value={"timezone": "UTC"})
+        client = OpenMeteoClient(decoder=decoder)
+        response = Mock(content=b'{"timezone": "UTC"}')
+        with patch.object(client.session, "get", return_value=response):
+            client.get_forecast({"latitude": 1})
+        decoder.assert_called_once_with(b'{"timezone": "UTC"}')
+        response.json.assert_not_called()
+        self.assertIs(OpenMeteoClient().decoder, openmeteo.json_loads)
+        client.close()
+
+
+class TestAsyncReport(unittest.TestCase):
+    def setUp(self):
+        self.cfg = Mock(latitude=52.52, longitude=13.41, timezone="UTC",
+                        scale="metric")
+        self.client = make_client(delay=0.05)
+
+    def tearDown(self):
+        openmeteo.FORECAST_CACHE.clear()
+
+    async def get_reports(self, count):
+        return await asyncio.gather(
+            *(async_get_report(self.cfg, PROFILE_MINIMAL, 1, 1, self.client)
+              for _ in range(count)), return_exceptions=True)
+
+    def test_concurrent_requests_share_a_download(self):
+        self.client.get_forecast.return_value = make_payload()
+        reports = asyncio.run(self.get_reports(3))
+        self.client.get_forecast.assert_called_once()
+        self.assertTrue(all(report is reports[0] for report in reports))
+        self.assertIsNotNone(openmeteo.FORECAST_CACHE.get(
+            openmeteo.get_cache_key(self.cfg)))
+
+    def test_errors_reach_every_waiting_request(self):
+        self.client.get_forecast.side_effect = ConnectionError("offline")
+        errors = asyncio.run(self.get_reports(2))
+        self.client.get_forecast.assert_called_once()
+        self.assertTrue(all(isinstance(error, ConnectionError)
+                            for error in errors))
+        self.assertIsNone(openmeteo.FORECAST_CACHE.get(
+            openmeteo.get_cache_key(self.cfg)))
+
+
+class TestCurrentRefresh(unittest.TestCase):
+    def setUp(self):
+        self.cfg = Mock(latitude=52.52, longitude=13.41, timezone="UTC",
+                        scale="imperial")
+        self.key = openmeteo.get_cache_key(self.cfg)
+        payload = make_payload()
+        payload["hourly_units"]["temperature_2m"] = "°C"
+        self.forecast = CachedForecast(payload)
+        self.forecast.current_at -= openmeteo.CURRENT_TTL
+        openmeteo.FORECAST_CACHE.put(self.key, self.forecast)
+        self.client = make_client()
+        self.client.get_forecast.return_value = {"current_weather": {
+            "time": "2023-08-16T05:15", "temperature": 30.0,
+            "windspeed": 2.0, "winddirection": 90, "weathercode": 3}}
+
+    def tearDown(self):
+        openmeteo.FORECAST_CACHE.clear()
+
+    def test_current_conditions_are_refreshed_alone(self):
+        report = self.forecast.report("imperial")
+        self.assertIs(get_report(self.cfg, PROFILE_MINIMAL, 1, 1, self.client),
+                      report)
+        params = self.client.get_forecast.call_args.args[0]
+        self.assertNotIn("hourly", params)
+        self.assertNotIn("daily", params)
+        self.assertEqual(report.current.temperature, 86.0)
+        self.assertEqual(report.current.wind_direction, "east")
+        self.assertEqual(report.current.condition.code,
+                         WeatherCondition(3).code)
+        self.assertEqual(report.current.date_time.minute, 15)
+        self.assertFalse(self.forecast.current_expired())
+        get_report(self.cfg, PROFILE_MINIMAL, 1, 1, self.client)
+        self.client.get_forecast.assert_called_once()
+
+    def test_forecasts_keep_cached_current_conditions(self):
+        get_report(self.cfg, PROFILE_STANDARD, 1, 1, self.client)
+        self.client.get_forecast.assert_not_called()
+
+
+class TestBulkFetch(unittest.TestCase):
+    def tearDown(self):
+        openmeteo.FORECAST_CACHE.clear()
+
+    @staticmethod
+    def make_config(latitude):
+        return Mock(latitude=latitude, longitude=13.41, timezone="UTC",
+                    scale="metric")
+
+    def test_misses_are_batched(self):
+        client = make_client()
+        client.get_forecast.side_effect = lambda params: [
+            make_payload() for _ in params["latitude"].split(",")]
+        configs = [self.make_config(latitude) for latitude in (50, 51, 52)]
+        cached = CachedForecast(make_payload())
+        openmeteo.FORECAST_CACHE.put(openmeteo.get_cache_key(configs[1]),
+                                     cached)
+        reports = get_reports(configs + configs[:1], PROFILE_MINIMAL, 1, 1,
+                              client=client, batch_size=1)
+        self.assertEqual(len(reports), 4)
+        self.assertIs(reports[1], cached.report("metric"))
+        self.assertIs(reports[0], reports[3])
+        self.assertEqual([call.args[0]["latitude"] for call in
+                          client.get_forecast.call_args_list], ["50.0", "52.0"])
+
+        openmeteo.FORECAST_CACHE.clear()
+        client.get_forecast.reset_mock()
+        get_reports(configs, PROFILE_MINIMAL, 1, 1, client=client)
+        client.get_forecast.assert_called_once()
+        self.assertEqual(client.get_forecast.call_args.args[0]["latitude"],
+                         "50.0,51.0,52.0")
+        self.assertEqual(len(openmeteo.FORECAST_CACHE), 3)
+
+    def test_batches_join_downloads_in_flight(self):
+        release = Event()
+        client = make_client()
+
+        def download(params):
+            release.wait(5)
+            if not isinstance(params["latitude"], str):
+                return make_payload()
+            return [make_payload() for _ in params["latitude"].split(",")]
+
+        client.get_forecast.side_effect = download
+        home, work = self.make_config(50), self.make_config(51)
+        single = Thread(target=get_report,
+                        args=(home, PROFILE_MINIMAL, 1, 1, client))
+        single.start()
+        while not openmeteo.FETCH_FLIGHTS.in_flight(
+                openmeteo.get_cache_key(home)):
+            sleep(0.01)
+        deduplicated = openmeteo.FETCH_FLIGHTS.deduplicated
+        Timer(0.05, release.set).start()
+        reports = get_reports([home, work], PROFILE_MINIMAL, 1, 1,
+                              client=client)
+        single.join(5)
+        self.assertEqual(sorted(float(call.args[0]["latitude"]) for call in
+                                client.get_forecast.call_args_list),
+                         [50.0, 51.0])
+        self.assertEqual(openmeteo.FETCH_FLIGHTS.deduplicated,
+                         deduplicated + 1)
+        self.assertEqual(len(reports), 2)
@@ -0,0 +1,62 @@
+import unittest
+from datetime import datetime, time, timedelta
+from unittest.mock import patch
+
+from skill_ovos_weather.weather_helpers import prefetch
+from skill_ovos_weather.weather_helpers.prefetch import (
+    PUBLISH_DELAY,
+    PrefetchScheduler,
+    parse_clock
+)
+
+
+class TestPrefetchScheduler(unittest.TestCase):
+    def test_next_run_is_aligned_to_the_hour(self):
+        scheduler = PrefetchScheduler(jitter=0)
+        now = datetime(2023, 8, 16, 10, 42, 7)
+        next_run = scheduler.next_run(now)
+        self.assertEqual(next_run, datetime(2023, 8, 16, 11) +
+                         timedelta(seconds=PUBLISH_DELAY))
+
+    def test_jitter(self):
+        scheduler = PrefetchScheduler(jitter=240)
+        now = datetime(2023, 8, 16, 10, 42)
+        with patch.object(prefetch.random, "uniform", return_value=120):
+            next_run = scheduler.next_run(now)
+        self.assertEqual(next_run, datetime(2023, 8, 16, 11, 3))
+
+    def test_backoff(self):
+        scheduler = PrefetchScheduler(jitter=0)
+        now = datetime(2023, 8, 16, 10, 42)
+        delays = []
+        for _ in range(8):
+            scheduler.record_result(False)
+            delays.append((scheduler.next_run(now) - now).total_seconds())
+        self.assertEqual(delays[:3], [60, 120, 240])
+        self.assertEqual(delays[-1], scheduler.interval)
+        scheduler.record_result(True)
+        self.assertEqual(scheduler.next_run(now).hour, 11)
+
+    def test_quiet_hours_over_midnight(self):
+        scheduler = PrefetchScheduler()
+        scheduler.configure(quiet_start="23:00", quiet_end="06:30")
+        self.assertEqual(scheduler.quiet_end, time(6, 30))
+        self.assertTrue(scheduler.in_quiet_hours(datetime(2023, 8, 16, 23, 30)))
+        self.assertTrue(scheduler.in_quiet_hours(datetime(2023, 8, 16, 3)))
+        self.assertFalse(scheduler.in_quiet_hours(datetime(2023, 8, 16, 12)))
+        scheduler.configure(quiet_start="", quiet_end="06:30")
+        self.assertFalse(scheduler.in_quiet_hours(datetime(2023, 8, 16, 3)))
+
+    def test_idle(self):
+        scheduler = PrefetchScheduler(idle_timeout=60)
+        now = datetime(2023, 8, 16, 12)
+        with patch.object(prefetch, "monotonic", return_value=scheduler.last_activity + 61):
+            self.assertTrue(scheduler.is_idle())
+            self.assertFalse(scheduler.should_run(now))
+            scheduler.record_activity()
+            self.assertTrue(scheduler.should_run(now))
+
+    def test_parse_clock(self):
+        self.assertEqual(parse_clock("7:05"), time(7, 5))
+        self.assertIsNone(parse_clock(""))
+        self.assertIsNone(parse_clock("late"))
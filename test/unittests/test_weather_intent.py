@@ -0,0 +1,71 @@
+import unittest
+from datetime import datetime
+from unittest.mock import Mock, patch
+
+import pytz
+from lingua_franca import load_language
+
+from skill_ovos_weather.weather_helpers import intent as intent_module
+from skill_ovos_weather.weather_helpers.intent import WeatherIntent
+from skill_ovos_weather.weather_helpers.openmeteo import (
+    MAX_FORECAST_DAYS,
+    PROFILE_STANDARD,
+    fetch_forecast
+)
+
+NOW = pytz.utc.localize(datetime(2023, 8, 16, 10, 30))
+
+
+def setUpModule():
+    load_language("en")
+
+
+class TestForecastHorizon(unittest.TestCase):
+    def make_intent(self, intent_datetime):
+        message = Mock(data={"utterance": "what is the weather"})
+        config = Mock(lang="en-us", latitude=52.52, longitude=13.41,
+                      timezone="UTC")
+        intent_data = WeatherIntent(message, config)
+        intent_data._location_datetime = NOW
+        intent_data._intent_datetime = intent_datetime
+        return intent_data
+
+    def test_current(self):
+        # the rest of today plus the hours shown on screen, the days shown
+        # on screen after today
+        self.assertEqual(self.make_intent(NOW).forecast_horizon, (18, 5))
+
+    def test_later_today(self):
+        later = NOW.replace(hour=21)
+        self.assertEqual(self.make_intent(later).forecast_horizon, (18, 5))
+
+    def test_tomorrow(self):
+        tomorrow = NOW.replace(day=17, hour=9)
+        self.assertEqual(self.make_intent(tomorrow).forecast_horizon, (42, 5))
+
+    def test_multiple_days(self):
+        next_week = NOW.replace(day=22, hour=0)
+        self.assertEqual(self.make_intent(next_week).forecast_horizon,
+                         (162, 7))
+
+    def test_configured_horizon(self):
+        intent_data = self.make_intent(None)
+        tomorrow = NOW.replace(day=17, hour=9)
+        with patch.object(intent_module, "now_local", return_value=NOW), \
+                patch.object(intent_module, "get_utterance_datetime",
+                             return_value=tomorrow):
+            # a day more than the horizon in the configured timezone
+            self.assertEqual(intent_data.configured_horizon, (66, 6))
+
+    def test_query_params(self):
+        client = Mock()
+        for intent_datetime, hours, days in ((NOW, 18, 5),
+                                             (NOW.replace(day=22), 162, 7)):
+            intent_data = self.make_intent(intent_datetime)
+            fetch_forecast(intent_data.config, PROFILE_STANDARD,
+                           *intent_data.forecast_horizon, client=client)
+            params = client.get_forecast.call_args.args[0]
+            self.assertEqual(params["past_hours"], 0)
+            self.assertEqual(params["forecast_hours"], hours)
+            self.assertEqual(params["forecast_days"], days)
+            self.assertLessEqual(params["forecast_days"], MAX_FORECAST_DAYS)
@@ -0,0 +1,217 @@
+import tracemalloc
+import unittest
+from array import array
+from datetime import date, datetime
+from unittest.mock import Mock, patch
+
+import pytz
+
+from skill_ovos_weather.weather_helpers.config import IMPERIAL, METRIC
+from skill_ovos_weather.weather_helpers.openmeteo import PROFILE_FULL
+from skill_ovos_weather.weather_helpers.weather import (
+    DAILY,
+    HOURLY,
+    ForecastTable,
+    TimeAxis,
+    WeatherCondition,
+    WeatherReport,
+    WeatherSeries,
+    convert_units,
+    to_column
+)
+
+from . import make_payload
+
+
+def full_payload(days=7):
+    """A week of every variable, the hourly values rise by half a unit."""
+    payload = make_payload(PROFILE_FULL, days, hourly=lambda idx: idx * 0.5,
+                           daily=lambda idx: 1.5)
+    del payload["current_weather"]
+    payload["hourly"]["weathercode"] = [3] * days * 24
+    payload["daily"]["weathercode"] = [61] * days
+    return payload
+
+
+class TestUnitConversion(unittest.TestCase):
+    series = {"time": ["2023-08-16T00:00", "2023-08-16T01:00"],
+              "temperature_2m": [20.0, None],
+              "windspeed_10m": [10.0, 0.0],
+              "precipitation": [25.4, 1.0],
+              "relativehumidity_2m": [50, 60]}
+    units = {"time": "iso8601",
+             "temperature_2m": "°C",
+             "windspeed_10m": "m/s",
+             "precipitation": "mm",
+             "relativehumidity_2m": "%"}
+
+    def test_metric_is_unchanged(self):
+        series, units = convert_units(self.series, self.units, METRIC)
+        self.assertEqual(series, self.series)
+        self.assertEqual(units, self.units)
+
+    def test_imperial(self):
+        series, units = convert_units(self.series, self.units, IMPERIAL)
+        self.assertEqual(series["temperature_2m"], [68.0, None])
+        self.assertEqual(series["windspeed_10m"], [22.4, 0.0])
+        self.assertEqual(series["precipitation"], [1.0, 0.039])
+        self.assertEqual(series["relativehumidity_2m"], [50, 60])
+        self.assertEqual(units["temperature_2m"], "°F")
+        self.assertEqual(units["windspeed_10m"], "mp/h")
+        self.assertEqual(units["precipitation"], "inch")
+        # the canonical payload is shared between unit systems
+        self.assertEqual(self.series["temperature_2m"], [20.0, None])
+
+
+class TestColumns(unittest.TestCase):
+    def test_to_column(self):
+        self.assertEqual(to_column([1, 2]), array("q", [1, 2]))
+        self.assertEqual(to_column([1, 2.5]), array("d", [1.0, 2.5]))
+        self.assertEqual(to_column([1, None]), [1, None])
+        self.assertEqual(to_column(["2023-08-16"]), ["2023-08-16"])
+
+    def test_series_views(self):
+        series = {"time": [f"2023-08-16T{hour:02d}:00" for hour in range(6)],
+                  "temperature_2m": [float(hour) for hour in range(6)],
+                  "weathercode": [0, 1, 2, 3, 45, 61]}
+        table = ForecastTable(series, {}, "UTC")
+        self.assertEqual(table.columns, {})
+        hourly = WeatherSeries(table)[2:]
+        self.assertEqual(len(hourly), 4)
+        self.assertEqual(hourly[0].temperature, 2.0)
+        self.assertEqual(hourly[-1].temperature, 5.0)
+        self.assertEqual([weather.temperature for weather in hourly[1:3]],
+                         [3.0, 4.0])
+        self.assertIsInstance(table.columns["temperature_2m"], array)
+        with self.assertRaises(IndexError):
+            hourly[4]
+
+    def test_rows_are_built_once_on_first_read(self):
+        series = {"time": ["2023-08-16T00:00", "2023-08-16T01:00"],
+                  "weathercode": [0, 3]}
+        table = ForecastTable(series, {}, "UTC")
+        hourly = WeatherSeries(table)
+        self.assertEqual(table._rows, {})
+        self.assertIs(hourly[1], hourly[1:][0])
+        self.assertEqual(list(table._rows), [1])
+
+
+class TestTimeAxis(unittest.TestCase):
+    def test_regular_axis(self):
+        times = [f"2023-08-16T{hour:02d}:00" for hour in range(24)]
+        axis = TimeAxis(times, "Europe/Berlin", utc_offset=7200)
+        self.assertEqual(axis.epochs[0], 1692136800)
+        self.assertEqual(axis.epochs[5] - axis.epochs[4], 3600)
+        self.assertEqual(axis.datetime(23).timestamp(), 1692219600)
+        self.assertEqual(axis.parse("2023-08-16T06:12").timestamp(),
+                         1692159120)
+
+    def test_report_timezone_without_offset(self):
+        axis = TimeAxis(["2023-08-16", "2023-08-17"], "Europe/Berlin")
+        self.assertEqual(list(axis.epochs), [1692136800, 1692223200])
+
+    def test_irregular_axis(self):
+        times = ["2023-08-16T00:00", "2023-08-16T01:00", "2023-08-16T03:00"]
+        axis = TimeAxis(times, "UTC")
+        self.assertEqual(axis.epochs[2] - axis.epochs[0], 3 * 3600)
+
+
+class TestWeatherCondition(unittest.TestCase):
+    def test_conditions_are_shared(self):
+        self.assertIs(WeatherCondition(61), WeatherCondition(61.0, True))
+        self.assertIsNot(WeatherCondition(61), WeatherCondition(61, False))
+        with self.assertRaises(AttributeError):
+            WeatherCondition(61).icon = "01d"
+
+    def test_resolved_attributes(self):
+        condition = WeatherCondition(3, False)
+        self.assertEqual(condition.category, "clouds")
+        self.assertEqual(condition.description, "overcast")
+        self.assertEqual(condition.image, "images/partial_clouds_night.svg")
+        self.assertEqual(condition.animation,
+                         "animations/partial_clouds.json")
+        self.assertEqual(condition.code, 1)
+        self.assertEqual(condition.animated_code, 3)
+
+
+class TestFootprint(unittest.TestCase):
+    def test_rows_have_no_instance_dict(self):
+        report = WeatherReport(full_payload(days=1))
+        hourly = WeatherSeries(report._hourly)
+        for obj in (report, report._hourly, hourly, hourly[0],
+                    hourly[0].condition):
+            self.assertFalse(hasattr(obj, "__dict__"), obj)
+
+    def test_report_footprint(self):
+        payload = full_payload()
+        WeatherReport(payload)
+        tracemalloc.start()
+        try:
+            report = WeatherReport(payload)
+            list(WeatherSeries(report._hourly))
+            list(WeatherSeries(report._daily))
+            size, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # 168 hours and 7 days of the full profile, every row built
+        self.assertLess(size, 180 * 1024)
+
+
+class TestTimeIndex(unittest.TestCase):
+    def setUp(self):
+        payload = full_payload()
+        payload["hourly"]["precipitation_probability"] = \
+            [50] * 10 + [0] * 2 + [80] * 156
+        self.report = WeatherReport(payload)
+        self.now = pytz.utc.localize(datetime(2023, 8, 16, 5, 30))
+        clock = patch("skill_ovos_weather.weather_helpers.weather.now_local",
+                      lambda tz=None: self.now.astimezone(tz))
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def test_at(self):
+        when = pytz.timezone("Europe/Berlin").localize(
+            datetime(2023, 8, 16, 15, 20))
+        self.assertEqual(self.report.at(when).temperature, 6.5)
+        self.assertEqual(self.report.at(when, DAILY).temperature_high, 1.5)
+        with self.assertRaises(IndexError):
+            self.report.at(pytz.utc.localize(datetime(2023, 8, 23, 0, 0)))
+        with self.assertRaises(IndexError):
+            self.report.at(pytz.utc.localize(datetime(2023, 8, 15, 23, 0)))
+
+    def test_between_and_days(self):
+        start = pytz.utc.localize(datetime(2023, 8, 16, 13, 30))
+        end = pytz.utc.localize(datetime(2023, 8, 16, 16, 0))
+        self.assertEqual([weather.temperature for weather
+                          in self.report.between(start, end, HOURLY)],
+                         [6.5, 7.0, 7.5])
+        self.assertEqual(len(self.report.between(start, None, DAILY)), 7)
+        hours = self.report.hours_of_day(date(2023, 8, 17))
+        self.assertEqual(len(hours), 24)
+        self.assertEqual(hours[0].temperature, 12.0)
+
+    def test_forecast_for_date_in_another_timezone(self):
+        payload = full_payload()
+        payload.update(timezone="Europe/Berlin", utc_offset_seconds=7200)
+        report = WeatherReport(payload)
+        # still the 16th in Berlin when the 17th starts in Tokyo
+        tomorrow = pytz.timezone("Asia/Tokyo").localize(
+            datetime(2023, 8, 17, 0, 0))
+        intent = Mock(intent_datetime=tomorrow, timeframe=DAILY)
+        self.assertIs(report.get_forecast_for_date(intent), report.daily[1])
+        self.assertIs(report.get_weather_for_intent(intent), report.daily[1])
+        intent.intent_datetime = tomorrow.replace(day=30)
+        with self.assertRaises(IndexError):
+            report.get_forecast_for_date(intent)
+
+    def test_weekend_forecast(self):
+        weekend = self.report.get_weekend_forecast()
+        self.assertEqual(len(weekend), 2)
+        self.assertIs(weekend[0], self.report.daily[3])
+        self.assertIs(weekend[1], self.report.daily[4])
+
+    def test_next_precipitation(self):
+        intent = Mock(location_datetime=self.now)
+        forecast, timeframe = self.report.get_next_precipitation(intent)
+        self.assertEqual(timeframe, HOURLY)
+        self.assertEqual(forecast.temperature, 6.0)
@@ -0,0 +1,108 @@
+import asyncio
+import threading
+import unittest
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock, PropertyMock, patch
+
+from lingua_franca import load_language
+from ovos_bus_client.message import Message
+from ovos_utils.messagebus import FakeBus
+
+from skill_ovos_weather import WeatherSkill
+from skill_ovos_weather.weather_helpers import PROFILE_STANDARD, openmeteo
+
+
+def setUpModule():
+    load_language("en")
+
+
+class TestEventLoop(unittest.TestCase):
+    def setUp(self):
+        # keep the forecast store out of the real cache directory
+        cache_dir = TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        xdg = patch("skill_ovos_weather.get_xdg_cache_save_path",
+                    return_value=cache_dir.name)
+        xdg.start()
+        self.addCleanup(xdg.stop)
+        self.skill = WeatherSkill()
+        self.skill._startup(FakeBus(), "skill-ovos-weather.openvoiceos")
+        self.addCleanup(self.shutdown)
+
+    def shutdown(self):
+        if not self.skill.event_loop.is_closed():
+            self.skill.shutdown()
+
+    def test_shutdown_releases_the_store(self):
+        started, cancelled = threading.Event(), threading.Event()
+
+        async def refresh():
+            started.set()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        async def start_refresh():
+            task = asyncio.ensure_future(refresh())
+            openmeteo._REFRESH_TASKS.add(task)
+            task.add_done_callback(openmeteo._REFRESH_TASKS.discard)
+
+        self.skill._run_async(start_refresh())
+        self.assertTrue(started.wait(5))
+        self.assertIs(openmeteo.FORECAST_STORE, self.skill.forecast_store)
+        self.skill.shutdown()
+        self.assertTrue(cancelled.is_set())
+        self.assertIsNone(openmeteo.FORECAST_STORE)
+
+    def test_run_async(self):
+        async def thread_name():
+            await asyncio.sleep(0)
+            return threading.current_thread().name
+
+        self.assertEqual(self.skill._run_async(thread_name()),
+                         self.skill._loop_thread.name)
+
+    def test_run_async_raises(self):
+        async def fail():
+            raise ValueError("no forecast")
+
+        with self.assertRaises(ValueError):
+            self.skill._run_async(fail())
+
+    def test_resolve_intent_downloads_configured_horizon(self):
+        intent_data = Mock(location="Paris", configured_horizon=(52, 6))
+        lookup = threading.Event()
+        type(intent_data).intent_datetime = PropertyMock(
+            side_effect=lambda: lookup.set())
+        get_report = Mock()
+
+        async def async_get_report(*args, **kwargs):
+            get_report(*args, **kwargs)
+
+        with patch("skill_ovos_weather.async_get_report", async_get_report):
+            self.skill._run_async(self.skill._async_resolve_intent(
+                intent_data))
+        self.assertTrue(lookup.is_set())
+        get_report.assert_called_once_with(
+            intent_data.config, PROFILE_STANDARD, hours=52, days=6,
+            client=self.skill.weather_client)
+
+    def test_resolve_intent_leaves_errors_to_the_handler(self):
+        intent_data = Mock(location="Atlantis", configured_horizon=(52, 6))
+        type(intent_data).intent_datetime = PropertyMock(
+            side_effect=LookupError("Atlantis"))
+        async def async_get_report(*args, **kwargs):
+            raise ConnectionError()
+
+        with patch("skill_ovos_weather.async_get_report", async_get_report):
+            self.skill._run_async(self.skill._async_resolve_intent(
+                intent_data))
+
+    def test_intent_without_location_runs_no_lookup(self):
+        message = Message("weather", {"utterance": "what is the weather"})
+        with patch.object(self.skill, "_run_async") as run_async:
+            intent_data = self.skill._get_intent_data(message)
+        self.assertIsNone(intent_data.location)
+        run_async.assert_not_called()
@@ -22,7 +22,38 @@ from .dialog import (
     get_dialog_for_timeframe,
 )
 from .intent import WeatherIntent
-from .util import LocationNotFoundError
+from .util import LocationNotFoundError, set_geolocation_cache
 from .weather import CURRENT, DAILY, Weather, HOURLY, WeatherReport
-from .openmeteo import get_report
+from .openmeteo import (
+    FETCH_FLIGHTS,
+    FORECAST_CACHE,
+    MAX_BATCH_SIZE,
+    MAX_FORECAST_DAYS,
+    PROFILE_FULL,
+    PROFILE_MINIMAL,
+    PROFILE_STANDARD,
+    OpenMeteoClient,
+    async_get_report,
+    async_refresh_report,
+    cancel_refreshes,
+    get_profile,
+    get_report,
+    get_reports,
+    load_forecast_store,
+    set_current_ttl,
+    set_forecast_store,
+    set_grid_resolution
+)
+from .prefetch import PrefetchScheduler
+from .backends import (
+    BACKEND_MEMORY,
+    BACKEND_REDIS,
+    BACKEND_SQLITE,
+    CacheBackend,
+    MemoryBackend,
+    RedisBackend,
+    SQLiteBackend,
+    create_backend
+)
+from .store import BackendForecastStore, ForecastStore, SQLiteForecastStore
 
@@ -0,0 +1,348 @@
+# Copyright 2021, Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Key/value backends shared by the forecast and geolocation caches."""
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from threading import RLock
+from time import monotonic, time
+from typing import Dict, Iterable, List, Optional
+
+from ovos_utils.log import LOG
+
+BACKEND_MEMORY = "memory"
+BACKEND_SQLITE = "sqlite"
+BACKEND_REDIS = "redis"
+DEFAULT_REDIS_URL = "redis://localhost:6379/0"
+DEFAULT_REDIS_TIMEOUT = 2
+
+
+class CacheBackend(ABC):
+    """Interface of a byte string cache whose keys expire.
+
+    Callers encode their values and namespace their keys, a ttl of None
+    keeps the value until it is deleted.  The bulk methods default to a
+    loop over the single key ones, backends override them when they can do
+    better.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the value of key, None if missing or expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float = None):
+        """Store value under key for ttl seconds."""
+
+    @abstractmethod
+    def ttl(self, key: str) -> Optional[float]:
+        """Return the seconds until key expires, None if missing or
+        if it never expires."""
+
+    @abstractmethod
+    def delete(self, key: str):
+        """Remove key if present."""
+
+    @abstractmethod
+    def scan(self, prefix: str) -> List[str]:
+        """List the live keys starting with prefix."""
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        """Return the values of every key found."""
+        values = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                values[key] = value
+        return values
+
+    def set_many(self, values: Dict[str, bytes], ttl: float = None):
+        """Store every value for ttl seconds."""
+        for key, value in values.items():
+            self.set(key, value, ttl)
+
+    def delete_many(self, keys: Iterable[str]):
+        """Remove every key present."""
+        for key in keys:
+            self.delete(key)
+
+    def ttl_many(self, keys: Iterable[str]) -> Dict[str, Optional[float]]:
+        """Return the seconds until every live key expires, None for the
+        keys that never expire."""
+        ttls = {}
+        for key in keys:
+            ttl = self.ttl(key)
+            if ttl is not None or self.get(key) is not None:
+                ttls[key] = ttl
+        return ttls
+
+    def close(self):
+        """Release the resources of the backend."""
+
+
+class MemoryBackend(CacheBackend):
+    """Process local backend, nothing is shared or persisted."""
+
+    def __init__(self):
+        self._values = {}
+        self._lock = RLock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._live(key)
+            return None if entry is None else entry[1]
+
+    def set(self, key: str, value: bytes, ttl: float = None):
+        expires_at = None if ttl is None else monotonic() + ttl
+        with self._lock:
+            self._values[key] = (expires_at, value)
+
+    def ttl(self, key: str) -> Optional[float]:
+        with self._lock:
+            entry = self._live(key)
+        if entry is None or entry[0] is None:
+            return None
+        return entry[0] - monotonic()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._values.pop(key, None)
+
+    def scan(self, prefix: str) -> List[str]:
+        with self._lock:
+            return [key for key in list(self._values)
+                    if key.startswith(prefix) and self._live(key)]
+
+    def _live(self, key: str) -> Optional[tuple]:
+        entry = self._values.get(key)
+        if entry is not None and entry[0] is not None \
+                and entry[0] <= monotonic():
+            del self._values[key]
+            return None
+        return entry
+
+
+class SQLiteBackend(CacheBackend):
+    """Backend on a SQLite file, shared by every process of a host.
+
+    The database runs in WAL mode so readers never block the writer, and
+    waits up to timeout for the lock held by another process.
+    """
+
+    def __init__(self, path: str, timeout: float = 5.0):
+        self.path = path
+        self._lock = RLock()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)),
+                    exist_ok=True)
+        # a single connection guarded by the lock, sqlite serializes the
+        # processes sharing the file
+        self._conn = sqlite3.connect(self.path, timeout=timeout,
+                                     check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS cache ("
+                               "key TEXT PRIMARY KEY, "
+                               "expires_at REAL, "
+                               "value BLOB NOT NULL)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS cache_expiry "
+                               "ON cache (expires_at)")
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.get_many([key]).get(key)
+
+    def set(self, key: str, value: bytes, ttl: float = None):
+        self.set_many({key: value}, ttl)
+
+    def ttl(self, key: str) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at FROM cache WHERE key = ? AND "
+                "(expires_at IS NULL OR expires_at > ?)",
+                (key, time())).fetchone()
+        if row is None or row[0] is None:
+            return None
+        return row[0] - time()
+
+    def delete(self, key: str):
+        self.delete_many([key])
+
+    def ttl_many(self, keys: Iterable[str]) -> Dict[str, Optional[float]]:
+        keys = list(keys)
+        if not keys:
+            return {}
+        marks = ",".join("?" * len(keys))
+        now = time()
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, expires_at FROM cache WHERE key IN ({marks}) "
+                f"AND (expires_at IS NULL OR expires_at > ?)",
+                (*keys, now)).fetchall()
+        return {key: None if expires_at is None else expires_at - now
+                for key, expires_at in rows}
+
+    def scan(self, prefix: str) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key FROM cache WHERE substr(key, 1, ?) = ? AND "
+                "(expires_at IS NULL OR expires_at > ?)",
+                (len(prefix), prefix, time())).fetchall()
+        return [row[0] for row in rows]
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        keys = list(keys)
+        if not keys:
+            return {}
+        marks = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, value FROM cache WHERE key IN ({marks}) AND "
+                f"(expires_at IS NULL OR expires_at > ?)",
+                (*keys, time())).fetchall()
+        return dict(rows)
+
+    def set_many(self, values: Dict[str, bytes], ttl: float = None):
+        now = time()
+        expires_at = None if ttl is None else now + ttl
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO cache VALUES (?, ?, ?)",
+                [(key, expires_at, value) for key, value in values.items()])
+            self._conn.execute("DELETE FROM cache WHERE expires_at <= ?",
+                               (now,))
+
+    def delete_many(self, keys: Iterable[str]):
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM cache WHERE key = ?",
+                                   [(key,) for key in keys])
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class RedisBackend(CacheBackend):
+    """Backend on a Redis server, shared by every device using it.
+
+    Any client speaking the redis-py API works, redis itself is only
+    imported when no client is given.  Keys are prefixed so the server can
+    be shared with other applications.
+    """
+
+    def __init__(self, client=None, url: str = DEFAULT_REDIS_URL,
+                 prefix: str = "ovos-weather:",
+                 timeout: float = DEFAULT_REDIS_TIMEOUT):
+        if client is None:
+            import redis  # optional dependency
+            # an unreachable server must not hold an intent for long
+            client = redis.Redis.from_url(url, socket_connect_timeout=timeout,
+                                          socket_timeout=timeout)
+        self.client = client
+        self.prefix = prefix
+
+    def ping(self):
+        """Raise if the server can not be reached."""
+        self.client.ping()
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: float = None):
+        self.set_many({key: value}, ttl)
+
+    def ttl(self, key: str) -> Optional[float]:
+        remaining = self.client.pttl(self.prefix + key)
+        # -2 for a missing key, -1 for a key without expiry
+        if remaining is None or remaining < 0:
+            return None
+        return remaining / 1000
+
+    def delete(self, key: str):
+        self.client.delete(self.prefix + key)
+
+    def ttl_many(self, keys: Iterable[str]) -> Dict[str, Optional[float]]:
+        keys = list(keys)
+        pipeline = self.client.pipeline()
+        for key in keys:
+            pipeline.pttl(self.prefix + key)
+        ttls = {}
+        for key, remaining in zip(keys, pipeline.execute()):
+            # -2 for a missing key, -1 for a key without expiry
+            if remaining is not None and remaining != -2:
+                ttls[key] = None if remaining < 0 else remaining / 1000
+        return ttls
+
+    def scan(self, prefix: str) -> List[str]:
+        keys = []
+        for key in self.client.scan_iter(match=self.prefix + prefix + "*"):
+            if isinstance(key, bytes):
+                key = key.decode("utf-8")
+            keys.append(key[len(self.prefix):])
+        return keys
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, bytes]:
+        keys = list(keys)
+        if not keys:
+            return {}
+        values = self.client.mget([self.prefix + key for key in keys])
+        return {key: value for key, value in zip(keys, values)
+                if value is not None}
+
+    def set_many(self, values: Dict[str, bytes], ttl: float = None):
+        if ttl is not None and ttl <= 0:
+            # redis rejects expiries in the past, the value is expired anyway
+            self.delete_many(values)
+            return
+        pipeline = self.client.pipeline()
+        for key, value in values.items():
+            if ttl is None:
+                pipeline.set(self.prefix + key, value)
+            else:
+                pipeline.set(self.prefix + key, value,
+                             px=max(1, int(ttl * 1000)))
+        pipeline.execute()
+
+    def delete_many(self, keys: Iterable[str]):
+        keys = [self.prefix + key for key in keys]
+        if keys:
+            self.client.delete(*keys)
+
+    def close(self):
+        self.client.close()
+
+
+def create_backend(name: str, path: str = None,
+                   url: str = DEFAULT_REDIS_URL) -> CacheBackend:
+    """Build the backend selected in the skill settings.
+
+    Args:
+        name: BACKEND_MEMORY, BACKEND_SQLITE or BACKEND_REDIS
+        path: the database file of the sqlite backend
+        url: the server of the redis backend
+
+    Returns:
+        the backend, a MemoryBackend if the selected one is unavailable
+    """
+    try:
+        if name == BACKEND_SQLITE:
+            return SQLiteBackend(path)
+        if name == BACKEND_REDIS:
+            backend = RedisBackend(url=url or DEFAULT_REDIS_URL)
+            backend.ping()
+            return backend
+    except ImportError:
+        LOG.error("The redis cache backend needs the redis package")
+    except Exception:
+        LOG.exception(f"Failed to open the {name} cache backend")
+    return MemoryBackend()
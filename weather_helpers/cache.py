@@ -0,0 +1,248 @@
+# Copyright 2021, Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""In-memory caching of weather reports."""
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import Future
+from threading import Lock, RLock
+from time import monotonic
+from typing import (Any, Awaitable, Callable, Dict, Hashable, List, Optional,
+                    Set, Tuple)
+
+DEFAULT_TTL = 60 * 15  # Open-Meteo model runs update at most every 15 mins
+DEFAULT_MAX_ENTRIES = 32
+DEFAULT_GRACE = 0  # seconds expired entries may still be served, 0 disables
+
+
+class ForecastCache:
+    """Thread safe LRU cache whose entries expire after a time to live.
+
+    Entries are keyed on the normalized request (see openmeteo.get_cache_key)
+    rather than on the WeatherConfig instance, so every intent asking for the
+    same location is served from the same entry.
+
+    With a grace window, entries older than the ttl are kept for another
+    grace seconds so get_stale can serve them while they are refreshed.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_TTL,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 grace: float = DEFAULT_GRACE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.grace = grace
+        self._entries = OrderedDict()
+        self._lock = RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, None if missing or expired.
+
+        Args:
+            key: normalized request key
+
+        Returns:
+            the cached value or None
+        """
+        value, stale = self.get_stale(key)
+        return None if stale else value
+
+    def get_stale(self, key: Hashable) -> Tuple[Optional[Any], bool]:
+        """Return the cached value for key, even if older than the ttl.
+
+        Args:
+            key: normalized request key
+
+        Returns:
+            (value, stale) where stale is True if the value outlived the ttl
+            but not the grace window, (None, False) if missing or expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None, False
+            stored_at, ttl, value = entry
+            ttl = self.ttl if ttl is None else ttl
+            age = monotonic() - stored_at
+            if age >= ttl + self.grace:
+                del self._entries[key]
+                return None, False
+            self._entries.move_to_end(key)
+            return value, age >= ttl
+
+    def put(self, key: Hashable, value: Any, age: float = 0,
+            ttl: float = None):
+        """Store a value, evicting the least recently used entries if needed.
+
+        Args:
+            key: normalized request key
+            value: the value to cache
+            age: seconds since the value was fetched, for values restored
+                 from the persistent store
+            ttl: seconds this entry stays valid, defaults to the cache ttl
+        """
+        with self._lock:
+            self._entries[key] = (monotonic() - age, ttl, value)
+            self._entries.move_to_end(key)
+            self._evict()
+
+    def configure(self, ttl: float = None, max_entries: int = None,
+                  grace: float = None):
+        """Change the time to live, entry bound and/or grace of the cache.
+
+        Args:
+            ttl: seconds an entry stays valid
+            max_entries: maximum number of entries kept in memory
+            grace: seconds an expired entry may still be served
+        """
+        with self._lock:
+            if ttl is not None:
+                self.ttl = float(ttl)
+            if grace is not None:
+                self.grace = max(0.0, float(grace))
+            if max_entries is not None:
+                self.max_entries = max(1, int(max_entries))
+            self._evict()
+
+    def clear(self):
+        """Drop every cached entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into a single execution.
+
+    The first caller for a key runs the function, every caller arriving
+    while it is in flight waits for and shares its result (or exception).
+    Threads and coroutines can wait on the same flight.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.deduplicated = 0
+        self._flights = {}
+        self._lock = Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run fn unless a call for key is already in flight.
+
+        Args:
+            key: identifies calls that can share a result
+            fn: the function to run
+
+        Returns:
+            (result, shared) where shared is True if another caller ran fn
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return future.result(), True
+        try:
+            result = fn()
+        except BaseException as e:
+            self._land(key, future, error=e)
+            raise
+        self._land(key, future, result=result)
+        return result, False
+
+    async def async_do(self, key: Hashable,
+                       fn: Callable[[], Awaitable]) -> Tuple[Any, bool]:
+        """Coroutine version of do, fn returns the awaitable to run.
+
+        Args:
+            key: identifies calls that can share a result
+            fn: the coroutine function to run
+
+        Returns:
+            (result, shared) where shared is True if another caller ran fn
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return await asyncio.wrap_future(future), True
+        try:
+            result = await fn()
+        except BaseException as e:
+            self._land(key, future, error=e)
+            raise
+        self._land(key, future, result=result)
+        return result, False
+
+    def do_many(self, keys: List[Hashable],
+                fn: Callable[[List[Hashable]], Dict[Hashable, Any]]
+                ) -> Tuple[Dict[Hashable, Any], Set[Hashable]]:
+        """Run fn once for every key not in flight, wait for the others.
+
+        Args:
+            keys: identify calls that can share a result
+            fn: the function to run, called with the keys it has to answer
+                and returning a result per key
+
+        Returns:
+            (results, shared) where shared holds the keys another caller ran
+        """
+        joined = {key: self._join(key) for key in keys}
+        own = [key for key, (_, leader) in joined.items() if leader]
+        results = {}
+        try:
+            if own:
+                results = fn(own)
+        except BaseException as e:
+            for key in own:
+                self._land(key, joined[key][0], error=e)
+            raise
+        for key in own:
+            if key in results:
+                self._land(key, joined[key][0], result=results[key])
+            else:
+                self._land(key, joined[key][0],
+                           error=KeyError(f"no result for {key}"))
+        shared = set()
+        for key, (future, leader) in joined.items():
+            if not leader:
+                results[key] = future.result()
+                shared.add(key)
+        return results, shared
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Check if a call for key is running."""
+        with self._lock:
+            return key in self._flights
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        with self._lock:
+            self.calls += 1
+            future = self._flights.get(key)
+            if future is not None:
+                self.deduplicated += 1
+                return future, False
+            future = self._flights[key] = Future()
+            return future, True
+
+    def _land(self, key: Hashable, future: Future, result: Any = None,
+              error: BaseException = None):
+        with self._lock:
+            del self._flights[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
@@ -14,7 +14,8 @@
 """Parse the intent into data used by the weather skill."""
 # TODO - get rid of relative imports as soon as skills can be properly packaged with arbitrary module structures
 
-from datetime import timedelta
+from datetime import datetime, timedelta
+from typing import Tuple
 
 from ovos_utils.time import now_local
 from lingua_franca.parse import normalize
@@ -27,6 +28,10 @@ from .util import (
 from .weather import CURRENT
 from .config import WeatherConfig
 
+# forecasts shown on screen next to the requested one
+GUI_FORECAST_HOURS = 4
+GUI_FORECAST_DAYS = 4
+
 
 class WeatherIntent:
     _geolocation = None
@@ -137,3 +142,53 @@ class WeatherIntent:
                 self._location_datetime = now_local(tz_info)
 
         return self._location_datetime
+
+    @property
+    def forecast_horizon(self) -> Tuple[int, int]:
+        """Determine how many hours and days of forecast the intent needs.
+
+        Hourly forecasts are needed up to the end of the requested day, the
+        daily humidity is computed from them, plus the hours shown on the
+        hourly forecast screen.  Daily forecasts are needed up to the
+        requested day plus the days shown on the daily forecast screen.
+
+        Returns:
+            (hours, days) counted from the current hour and from today
+        """
+        return get_forecast_horizon(self.location_datetime,
+                                    self.intent_datetime)
+
+    @property
+    def configured_horizon(self) -> Tuple[int, int]:
+        """Estimate the forecast_horizon without looking up the location.
+
+        The date in the utterance is read in the configured timezone.  The
+        requested location is at most a day ahead of it, so one more day of
+        forecast covers the intent wherever it is.
+
+        Returns:
+            (hours, days) counted from the current hour and from today
+        """
+        now = now_local()
+        utterance_datetime = get_utterance_datetime(
+            self.utterance, language=self.config.lang
+        )
+        hours, days = get_forecast_horizon(now, utterance_datetime or now)
+        return hours + 24, days + 1
+
+
+def get_forecast_horizon(now: datetime, intent_datetime: datetime
+                         ) -> Tuple[int, int]:
+    """Count the hours and days of forecast an intent needs.
+
+    Args:
+        now: the current date and time at the requested location
+        intent_datetime: the date and time the intent asks about
+
+    Returns:
+        (hours, days) counted from the current hour and from today
+    """
+    day_offset = max(0, (intent_datetime.date() - now.date()).days)
+    hours = (day_offset + 1) * 24 - now.hour
+    days = day_offset + 1
+    return hours + GUI_FORECAST_HOURS, max(days, GUI_FORECAST_DAYS + 1)
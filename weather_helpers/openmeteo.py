@@ -1,5 +1,7 @@
 import requests
-from ovos_utils import timed_lru_cache
+from ovos_utils.log import LOG
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry, make_headers
 
 # TODO - get rid of relative imports
 # /home/miro/PycharmProjects/.venvs/ovos/bin/python /home/miro/PycharmProjects/skill-ovos-weather/weather_helpers/openmeteo.py
@@ -8,140 +10,949 @@ from ovos_utils import timed_lru_cache
 #     from .config import *
 # ImportError: attempted relative import with no known parent package
 # so annoying
-from datetime import datetime as dt
+import asyncio
+import json
+import time
+from bisect import bisect_left, bisect_right
+from threading import Lock, Thread
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
-from .util import chunk_list
+# forecasts hold thousands of floats, decode them with the fastest
+# json library installed, every candidate accepts the raw response bytes
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    try:
+        import ujson
+        json_loads = ujson.loads
+    except ImportError:
+        json_loads = json.loads
+
+from .cache import ForecastCache, SingleFlight
+from .store import BackendForecastStore, ForecastStore
 from .config import *
-from .weather import WeatherReport
+from .weather import CURRENT, WeatherReport, get_time_offsets
+
+# forecasts are served up to FORECAST_GRACE seconds past their ttl while a
+# fresh one is downloaded in the background
+FORECAST_GRACE = 60 * 15
+FORECAST_CACHE = ForecastCache(grace=FORECAST_GRACE)
+# downloads in progress, concurrent requests for a location share one
+FETCH_FLIGHTS = SingleFlight()
+_REFRESH_TASKS = set()
+# blocking callers run the coroutines of this module on a loop of its own
+_SYNC_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_SYNC_LOOP_LOCK = Lock()
+FORECAST_STORE: Optional[Union[ForecastStore, BackendForecastStore]] = None
+
+# Parameter profiles, each one requests a superset of the previous profile so a
+# cached larger profile can answer a request for a smaller one
+PROFILE_MINIMAL = "minimal"  # what is spoken or shown on screen
+PROFILE_STANDARD = "standard"  # everything Weather reads
+PROFILE_FULL = "full"  # every variable the skill ever requested
+PROFILES = (PROFILE_MINIMAL, PROFILE_STANDARD, PROFILE_FULL)
+
+MINIMAL_HOURLY_PARAMS = [
+    "temperature_2m",
+    "relativehumidity_2m",
+    "windspeed_10m",
+    "winddirection_10m",
+    "precipitation_probability",
+    "weathercode"]
+MINIMAL_DAILY_PARAMS = [
+    "temperature_2m_max",
+    "temperature_2m_min",
+    "weathercode",
+    "sunrise",
+    "sunset",
+    "windspeed_10m_max",
+    "winddirection_10m_dominant",
+    "precipitation_probability_mean",
+    "precipitation_probability_min",
+    "precipitation_probability_max"]
+STANDARD_HOURLY_PARAMS = MINIMAL_HOURLY_PARAMS + [
+    "dewpoint_2m",
+    "surface_pressure",
+    "cloudcover",
+    "shortwave_radiation",
+    "precipitation",
+    "visibility"]
+STANDARD_DAILY_PARAMS = MINIMAL_DAILY_PARAMS + [
+    "precipitation_sum",
+    "uv_index_max"]
+FULL_HOURLY_PARAMS = STANDARD_HOURLY_PARAMS + [
+    "apparent_temperature",
+    "pressure_msl",
+    "cloudcover_low",
+    "cloudcover_mid",
+    "cloudcover_high",
+    "windspeed_80m",
+    "windspeed_120m",
+    "windspeed_180m",
+    "winddirection_80m",
+    "winddirection_120m",
+    "winddirection_180m",
+    "windgusts_10m",
+    "direct_radiation",
+    "diffuse_radiation",
+    "vapor_pressure_deficit",
+    "cape",
+    "evapotranspiration",
+    "et0_fao_evapotranspiration",
+    "snow_depth",
+    "showers",
+    "snowfall",
+    "freezinglevel_height",
+    "soil_temperature_0cm",
+    "soil_temperature_6cm",
+    "soil_temperature_18cm",
+    "soil_temperature_54cm",
+    "soil_moisture_0_1cm",
+    "soil_moisture_1_3cm",
+    "soil_moisture_3_9cm",
+    "soil_moisture_9_27cm",
+    "soil_moisture_27_81cm",
+    "relativehumidity_1000hPa",
+    "is_day"]
+FULL_DAILY_PARAMS = STANDARD_DAILY_PARAMS + [
+    "apparent_temperature_max",
+    "apparent_temperature_min",
+    "precipitation_hours",
+    "windgusts_10m_max",
+    "shortwave_radiation_sum",
+    "et0_fao_evapotranspiration",
+    "uv_index_clear_sky_max"]
+# daily statistics computed from hourly variables once per download, the
+# variables Open-Meteo already aggregates daily are left out
+DAILY_ROLLUPS = {
+    "relativehumidity_2m": ("min", "max", "mean"),
+    "cloudcover": ("max", "mean"),
+    "dewpoint_2m": ("min", "max", "mean")
+}
+ROLLUP_STATS = {
+    "min": min,
+    "max": max,
+    "sum": sum,
+    "mean": lambda values: sum(values) / len(values)
+}
+MAX_FORECAST_DAYS = 7
+MAX_BATCH_SIZE = 20  # locations per request, bounded by the url length
+# coordinates are snapped to a grid of this many degrees, about 2 km, the
+# cell size of the finest models Open-Meteo blends, so nearby requests
+# share a forecast
+GRID_RESOLUTION = 0.02
+# current conditions older than this are refreshed with a current_weather
+# only request, the hourly and daily blocks stay cached for the cache ttl
+CURRENT_TTL = 60 * 5
+
+PROFILE_PARAMS = {
+    PROFILE_MINIMAL: (MINIMAL_HOURLY_PARAMS, MINIMAL_DAILY_PARAMS),
+    PROFILE_STANDARD: (STANDARD_HOURLY_PARAMS, STANDARD_DAILY_PARAMS),
+    PROFILE_FULL: (FULL_HOURLY_PARAMS, FULL_DAILY_PARAMS)
+}
+
+
+class OpenMeteoClient:
+    """Open-Meteo forecast API client reusing pooled keep-alive connections.
+
+    Each fetch used to go through requests.get, paying for DNS, TCP and TLS
+    setup every time.  The client is owned by the skill and closed when the
+    skill shuts down.
+    """
+    url = "https://api.open-meteo.com/v1/forecast"
+
+    def __init__(self, connect_timeout: float = 3.05,
+                 read_timeout: float = 10, pool_size: int = 4,
+                 retries: int = 2,
+                 decoder: Callable[[bytes], Any] = None):
+        self.timeout = (connect_timeout, read_timeout)
+        self.decoder = decoder or json_loads
+        self.adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=retries, backoff_factor=0.3,
+                              status_forcelist=(500, 502, 503, 504),
+                              raise_on_status=False)
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", self.adapter)
+        # negotiates brotli in addition to gzip when a decoder is installed
+        self.session.headers.update(make_headers(keep_alive=True,
+                                                 accept_encoding=True))
+
+    def get_forecast(self, params: dict) -> dict:
+        """
+        Query the forecast endpoint.
+
+        Args:
+            params (dict): the query parameters
+
+        Returns:
+            dict: the decoded json response, a list of them when several
+                  coordinates were requested
+
+        Raises:
+            HTTPError if the API answered with an error status
+        """
+        response = self.session.get(self.url, params=params,
+                                    timeout=self.timeout)
+        response.raise_for_status()
+        # decode the body bytes directly, response.json() builds a str first
+        return self.decoder(response.content)
+
+    async def async_get_forecast(self, params: dict) -> dict:
+        """
+        Query the forecast endpoint without blocking the event loop.
+
+        The pooled session is kept for keep-alive, the blocking call runs in
+        the default executor of the running loop.
+
+        Args:
+            params (dict): the query parameters
+
+        Returns:
+            dict: the decoded json response
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_forecast, params)
+
+    def close(self):
+        """Close every pooled connection."""
+        self.session.close()
+
+
+_DEFAULT_CLIENT: Optional[OpenMeteoClient] = None
+
+
+def get_default_client() -> OpenMeteoClient:
+    """
+    Get the client used when the caller doesn't provide one.
+
+    Returns:
+        OpenMeteoClient: a client shared by the whole process
+    """
+    global _DEFAULT_CLIENT
+    if _DEFAULT_CLIENT is None:
+        _DEFAULT_CLIENT = OpenMeteoClient()
+    return _DEFAULT_CLIENT
+
 
-def sliced(data: dict) -> dict:
+def add_daily_rollups(data: dict) -> dict:
     """
-    Openmeteo is sending data starting at 00:00 local-time,
-    This slices the hourly data up until the current hour.
+    Compute the daily statistics of DAILY_ROLLUPS, which Open-Meteo only
+    sends hourly, as <variable>_<stat> daily variables.
+
+    Days are grouped on the dates of the hourly times, which Open-Meteo
+    renders with the single utc offset of the response.  The times sort
+    as strings, every day is a contiguous range found by bisection and
+    each statistic is computed by the builtins over the day's slice.
+
+    A rollup only covers the hours of the day present in the payload.
+    Forecasts are requested from the current hour on (past_hours is 0),
+    so the rollups of today are about the rest of the day.  Days past
+    the requested forecast_hours have no hours and their rollups are
+    None, the intent horizon requests hours up to the end of the day it
+    is about.
 
     Args:
         data (dict): the weather json report sent from om
 
     Returns:
-        dict: the sliced report
+        dict: the report with the daily rollups
     """
-    time = data.get("current_weather",{}).get("time")
-    hour = dt.fromisoformat(time).hour
+    hourly, daily = data["hourly"], data["daily"]
+    hours = hourly["time"]
+    days = []
+    for day in daily["time"]:
+        start = bisect_left(hours, day)
+        days.append((start, bisect_right(hours, day + "T99", start)))
+    for variable, stats in DAILY_ROLLUPS.items():
+        series = hourly.get(variable)
+        if series is None:
+            continue
+        values = [[value for value in series[start:end] if value is not None]
+                  for start, end in days]
+        for stat in stats:
+            rollup = ROLLUP_STATS[stat]
+            daily[f"{variable}_{stat}"] = [rollup(day) if day else None
+                                           for day in values]
+            unit = data.get("hourly_units", {}).get(variable)
+            if unit is not None:
+                data.setdefault("daily_units", {})[f"{variable}_{stat}"] = unit
+    # the daily humidity Weather reads, in whole percents
+    if "relativehumidity_2m_mean" in daily:
+        daily["relativehumidity_2m"] = [
+            None if mean is None else int(mean)
+            for mean in daily["relativehumidity_2m_mean"]]
+    return data
 
-    for k, v in data["hourly"].items():
-        # compute missing/nice to have daily parameters
-        if k == "relativehumidity_2m":
-            data["daily"][k] = [int(sum(tup)/len(tup)) for tup
-                                in chunk_list(v, 24)]
-        # slice data
-        if isinstance(v, list):
-            data["hourly"][k] = v[hour:]
 
-    return data
+def get_profile(timeframe: str) -> str:
+    """
+    Pick the smallest parameter profile able to answer an intent timeframe.
+
+    Args:
+        timeframe (str): CURRENT, HOURLY or DAILY
+
+    Returns:
+        str: the parameter profile to request
+    """
+    if timeframe == CURRENT:
+        return PROFILE_MINIMAL
+    return PROFILE_STANDARD
+
+
+class CachedForecast:
+    """A canonical (metric) payload and the reports built from it.
+
+    The unit system only changes how the payload is presented, so a single
+    download serves metric and imperial reports for the same location.
+    The payload is kept whole, reports find the current hour when they are
+    read, so the forecast stays usable after the hour rolls over.
+    """
+
+    def __init__(self, payload: dict, fetched_at: float = None):
+        self.payload = add_daily_rollups(payload)
+        # wall clock time of the download, tells apart copies in the store
+        self.fetched_at = fetched_at or time.time()
+        self.profile = PROFILE_MINIMAL
+        for profile in PROFILES:
+            hourly_params, daily_params = PROFILE_PARAMS[profile]
+            if not (set(hourly_params) <= self.payload["hourly"].keys() and
+                    set(daily_params) <= self.payload["daily"].keys()):
+                break
+            self.profile = profile
+        self.current_at = time.monotonic()
+        self._reports = {}
+        self._lock = Lock()
+
+    @property
+    def horizon(self) -> Tuple[int, int]:
+        """The hourly and daily forecasts left from the current hour and
+        today, they shrink as the clock moves on."""
+        hour, day = get_time_offsets(self.payload)
+        return (len(self.payload["hourly"]["time"]) - hour,
+                len(self.payload["daily"]["time"]) - day)
+
+    @property
+    def hours(self) -> int:
+        """Hourly forecasts left, starting at the current hour."""
+        return self.horizon[0]
+
+    @property
+    def days(self) -> int:
+        """Daily forecasts left, starting today."""
+        return self.horizon[1]
+
+    def covers(self, profile: str, hours: int, days: int) -> bool:
+        """
+        Check if the payload holds every variable of a profile over the
+        requested horizon.
+
+        Args:
+            profile (str): the requested parameter profile
+            hours (int): hourly forecasts needed, starting at the current hour
+            days (int): daily forecasts needed, starting today
+
+        Returns:
+            bool: True if this forecast can answer the request
+        """
+        if PROFILES.index(self.profile) < PROFILES.index(profile):
+            return False
+        hours_left, days_left = self.horizon
+        return hours_left >= hours and days_left >= days
+
+    def current_expired(self) -> bool:
+        """Check if the current conditions are older than CURRENT_TTL."""
+        return time.monotonic() - self.current_at >= CURRENT_TTL
+
+    def update_current(self, current_weather: dict):
+        """
+        Replace the current conditions of the payload and of every report
+        built from it.
+
+        Args:
+            current_weather (dict): a newer current_weather block
+        """
+        with self._lock:
+            self.payload["current_weather"] = current_weather
+            self.current_at = time.monotonic()
+            for report in self._reports.values():
+                report.update_current(current_weather)
+
+    def report(self, scale: str) -> WeatherReport:
+        """
+        Get the report for a unit system, built on first use.
+
+        Args:
+            scale (str): METRIC or IMPERIAL
+
+        Returns:
+            WeatherReport: the report in the requested units
+        """
+        with self._lock:
+            if scale not in self._reports:
+                self._reports[scale] = WeatherReport(self.payload, scale)
+            return self._reports[scale]
+
+
+def set_current_ttl(ttl: Optional[float]):
+    """
+    Change how long current conditions are reused before a light refresh.
+
+    Args:
+        ttl (float): seconds, 0 refreshes them on every request
+    """
+    global CURRENT_TTL
+    if ttl is not None:
+        CURRENT_TTL = max(0.0, float(ttl))
+
+
+def set_grid_resolution(resolution: Optional[float]):
+    """
+    Change the grid coordinates are snapped to, 0 keeps them as they are.
+
+    Args:
+        resolution (float): size of a grid cell in degrees
+    """
+    global GRID_RESOLUTION
+    if resolution is not None:
+        GRID_RESOLUTION = max(0.0, float(resolution))
+
+
+def get_grid_point(cfg: WeatherConfig) -> Tuple[float, float]:
+    """
+    Snap the config coordinates to the nearest point of the grid, used for
+    both the cache key and the request so a cached forecast always belongs
+    to the point it is keyed on.
+
+    Args:
+        cfg (WeatherConfig): the config the report is requested for
+
+    Returns:
+        tuple: (latitude, longitude)
+    """
+    latitude, longitude = float(cfg.latitude), float(cfg.longitude)
+    if GRID_RESOLUTION:
+        latitude = round(latitude / GRID_RESOLUTION) * GRID_RESOLUTION
+        longitude = round(longitude / GRID_RESOLUTION) * GRID_RESOLUTION
+    return round(latitude, 4), round(longitude, 4)
+
+
+def get_cache_key(cfg: WeatherConfig) -> tuple:
+    """
+    Normalize the parts of the config that change the Open-Meteo response,
+    a new WeatherConfig is built for every intent so it can't be the key.
+    Units are converted locally and are not part of the key.
+
+    Args:
+        cfg (WeatherConfig): the config the report is requested for
+
+    Returns:
+        tuple: (latitude, longitude, timezone) of the grid point
+    """
+    return (*get_grid_point(cfg), cfg.timezone)
+
+
+def set_forecast_store(store: Optional[Union[ForecastStore,
+                                             BackendForecastStore]]):
+    """
+    Persist every downloaded payload to store and use it to answer
+    requests the in-memory cache can't, None disables persistence.
+
+    Args:
+        store (ForecastStore): the json file store, or a
+                               BackendForecastStore over a CacheBackend,
+                               like SQLiteForecastStore, to share downloads
+                               with other processes
+    """
+    global FORECAST_STORE
+    FORECAST_STORE = store
+
+
+def load_forecast_store() -> int:
+    """
+    Fill FORECAST_CACHE with the most recent stored payloads younger than
+    the cache ttl and grace window, so the first query after a restart
+    doesn't wait for the network.  Only as many as the cache keeps are
+    loaded.
+
+    Returns:
+        int: number of forecasts restored
+    """
+    if FORECAST_STORE is None:
+        return 0
+    restored = 0
+    entries = FORECAST_STORE.entries(FORECAST_CACHE.max_entries)
+    # oldest first, the most recent download ends up most recently used
+    for key, payload, fetched_at in reversed(entries):
+        try:
+            if _restore_forecast(key, payload, fetched_at) is not None:
+                restored += 1
+        except Exception:
+            LOG.exception(f"Failed to restore stored forecast for {key}")
+    return restored
+
+
+def get_report(cfg: WeatherConfig, profile: str = PROFILE_STANDARD,
+               hours: int = None, days: int = None,
+               client: OpenMeteoClient = None) -> WeatherReport:
+    """
+    Blocking version of async_get_report.
+
+    Args:
+        cfg (WeatherConfig): the config the report is requested for
+        profile (str): the parameter profile the caller needs
+        hours (int): hourly forecasts needed, defaults to the whole horizon
+        days (int): daily forecasts needed, defaults to MAX_FORECAST_DAYS
+        client (OpenMeteoClient): the client used on a cache miss
+
+    Returns:
+        WeatherReport: the parsed Open-Meteo report in the config units
+    """
+    return _run_sync(async_get_report(cfg, profile, hours, days, client))
+
+
+async def async_get_report(cfg: WeatherConfig,
+                           profile: str = PROFILE_STANDARD,
+                           hours: int = None, days: int = None,
+                           client: OpenMeteoClient = None) -> WeatherReport:
+    """
+    Get the weather report for the config location, served from
+    FORECAST_CACHE when a request for the same or a larger profile and
+    horizon was answered within the cache ttl and from FORECAST_STORE when
+    the memory cache is cold.
+
+    A cached forecast that is too small is extended, the new request asks
+    for the union of what was cached and what is needed now.  Concurrent
+    cache misses for the same location wait for a single download.
+
+    A forecast older than the ttl but within the cache grace window is
+    returned at once while a fresh one is downloaded in the background.
+
+    Requests for the minimal profile are about the current conditions, if
+    those are older than CURRENT_TTL they alone are downloaded again.
 
+    The event loop keeps running while the forecast is downloaded, the
+    cache and store work runs in its default executor.
 
-@timed_lru_cache(seconds=60 * 15)  # cache for 15 mins
-def get_report(cfg: WeatherConfig):
-    if cfg.speed_unit == MILES_PER_HOUR:
-        windspeed_unit = "mph"
-    elif cfg.speed_unit == METER_PER_SECOND:
-        windspeed_unit = "ms"
-    elif cfg.speed_unit == KILOMETER_PER_HOUR:
-        windspeed_unit = "kmh"
-    else:
-        raise ValueError("invalid speed unit")
-
-    if cfg.temperature_unit == CELSIUS:
-        temperature_unit = "celsius"
-    elif cfg.temperature_unit == FAHRENHEIT:
-        temperature_unit = "fahrenheit"
-    else:
-        raise ValueError("invalid temperature unit")
-
-    if cfg.precipitation_unit == MILLIMETER:
-        precipitation_unit = "mm"
-    elif cfg.precipitation_unit == INCH:
-        precipitation_unit = "inch"
-    else:
-        raise ValueError("invalid precipitation unit")
-
-    daily_params = [
-        "temperature_2m_max",
-        "temperature_2m_min",
-        "apparent_temperature_max",
-        "apparent_temperature_min",
-        "precipitation_sum",
-        "precipitation_hours",
-        "weathercode",
-        "sunrise",
-        "sunset",
-        "windspeed_10m_max",
-        "windgusts_10m_max",
-        "winddirection_10m_dominant",
-        "shortwave_radiation_sum",
-        "et0_fao_evapotranspiration",
-        "uv_index_max",
-        "precipitation_probability_mean",
-        "precipitation_probability_min",
-        "precipitation_probability_max",
-        "uv_index_clear_sky_max"]
-    hourly_params = ["temperature_2m",
-                     "relativehumidity_2m",
-                     "dewpoint_2m",
-                     "apparent_temperature",
-                     "pressure_msl",
-                     "surface_pressure",
-                     "cloudcover",
-                     "cloudcover_low",
-                     "cloudcover_mid",
-                     "cloudcover_high",
-                     "windspeed_10m",
-                     "windspeed_80m",
-                     "windspeed_120m",
-                     "windspeed_180m",
-                     "winddirection_10m",
-                     "winddirection_80m",
-                     "winddirection_120m",
-                     "winddirection_180m",
-                     "windgusts_10m",
-                     "shortwave_radiation",
-                     "direct_radiation",
-                     "diffuse_radiation",
-                     "vapor_pressure_deficit",
-                     "cape",
-                     "evapotranspiration",
-                     "et0_fao_evapotranspiration",
-                     "precipitation",
-                     "weathercode",
-                     "snow_depth",
-                     "showers",
-                     "snowfall",
-                     "visibility",
-                     "precipitation_probability",
-                     "freezinglevel_height",
-                     "soil_temperature_0cm",
-                     "soil_temperature_6cm",
-                     "soil_temperature_18cm",
-                     "soil_temperature_54cm",
-                     "soil_moisture_0_1cm",
-                     "soil_moisture_1_3cm",
-                     "soil_moisture_3_9cm",
-                     "soil_moisture_9_27cm",
-                     "soil_moisture_27_81cm",
-                     "relativehumidity_1000hPa",
-                     "is_day"]
-
-    args = {
-        "longitude": cfg.longitude,
-        "latitude": cfg.latitude,
+    Args:
+        cfg (WeatherConfig): the config the report is requested for
+        profile (str): the parameter profile the caller needs
+        hours (int): hourly forecasts needed, defaults to the whole horizon
+        days (int): daily forecasts needed, defaults to MAX_FORECAST_DAYS
+        client (OpenMeteoClient): the client used on a cache miss
+
+    Returns:
+        WeatherReport: the parsed Open-Meteo report in the config units
+    """
+    key = get_cache_key(cfg)
+    loop = asyncio.get_running_loop()
+    # the forecast store may be on disk or across the network
+    forecast, request = await loop.run_in_executor(
+        None, _lookup_forecast, key, profile, hours, days)
+
+    async def fetch():
+        payload = await async_fetch_forecast(cfg, *request, client=client)
+        return await loop.run_in_executor(None, _cache_payload, key, payload)
+
+    if forecast is None:
+        forecast, shared = await FETCH_FLIGHTS.async_do(key, fetch)
+        if shared and not forecast.covers(*request):
+            # joined a download for a smaller profile or horizon
+            forecast = await fetch()
+    elif request is not None and not FETCH_FLIGHTS.in_flight(key):
+        # keep a reference, the loop only holds weak ones to its tasks
+        task = asyncio.ensure_future(_async_refresh_forecast(key, fetch))
+        _REFRESH_TASKS.add(task)
+        task.add_done_callback(_REFRESH_TASKS.discard)
+    if profile == PROFILE_MINIMAL and forecast.current_expired():
+        try:
+            current, _ = await FETCH_FLIGHTS.async_do(
+                (key, CURRENT),
+                lambda: async_fetch_current_weather(cfg, client))
+            forecast.update_current(current)
+        except Exception:
+            LOG.exception("Failed to refresh the current conditions")
+    return forecast.report(cfg.scale)
+
+
+async def async_refresh_report(cfg: WeatherConfig,
+                               profile: str = PROFILE_STANDARD,
+                               hours: int = None, days: int = None,
+                               ttl: float = None,
+                               client: OpenMeteoClient = None) -> WeatherReport:
+    """
+    Download the forecast for the config location even if a cached one is
+    still valid, used to keep frequently queried locations warm.
+
+    Args:
+        cfg (WeatherConfig): the config the report is requested for
+        profile (str): the parameter profile to download
+        hours (int): hourly forecasts needed, defaults to the whole horizon
+        days (int): daily forecasts needed, defaults to MAX_FORECAST_DAYS
+        ttl (float): seconds the download stays valid, defaults to the
+                     FORECAST_CACHE ttl
+        client (OpenMeteoClient): the client used for the download
+
+    Returns:
+        WeatherReport: the parsed Open-Meteo report in the config units
+    """
+    key = get_cache_key(cfg)
+    days = min(days or MAX_FORECAST_DAYS, MAX_FORECAST_DAYS)
+    hours = min(hours or days * 24, MAX_FORECAST_DAYS * 24)
+    loop = asyncio.get_running_loop()
+
+    async def fetch():
+        payload = await async_fetch_forecast(cfg, profile, hours, days,
+                                             client=client)
+        return await loop.run_in_executor(None, _cache_payload, key,
+                                          payload, ttl)
+
+    forecast, shared = await FETCH_FLIGHTS.async_do(key, fetch)
+    if shared and not forecast.covers(profile, hours, days):
+        forecast = await fetch()
+    return forecast.report(cfg.scale)
+
+
+async def cancel_refreshes():
+    """Cancel the background refreshes running on the current event loop."""
+    tasks = _REFRESH_TASKS & asyncio.all_tasks()
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _run_sync(coroutine):
+    """Run a coroutine of this module for a blocking caller.
+
+    The coroutines run on a loop shared by every blocking caller, so the
+    refreshes they start in the background outlive the call.
+    """
+    global _SYNC_LOOP
+    with _SYNC_LOOP_LOCK:
+        if _SYNC_LOOP is None:
+            _SYNC_LOOP = asyncio.new_event_loop()
+            Thread(target=_SYNC_LOOP.run_forever, name="openmeteo.sync_loop",
+                   daemon=True).start()
+    return asyncio.run_coroutine_threadsafe(coroutine, _SYNC_LOOP).result()
+
+
+def get_reports(configs: List[WeatherConfig],
+                profile: str = PROFILE_STANDARD, hours: int = None,
+                days: int = None, client: OpenMeteoClient = None,
+                batch_size: int = MAX_BATCH_SIZE) -> List[WeatherReport]:
+    """
+    Get the weather reports for many locations, cache misses are downloaded
+    together by passing coordinate lists to Open-Meteo.
+
+    Stale forecasts are returned at once and refreshed by a batched download
+    in the background, see get_report.
+
+    Args:
+        configs (list): the configs the reports are requested for
+        profile (str): the parameter profile the caller needs
+        hours (int): hourly forecasts needed, defaults to the whole horizon
+        days (int): daily forecasts needed, defaults to MAX_FORECAST_DAYS
+        client (OpenMeteoClient): the client used on cache misses
+        batch_size (int): maximum number of locations per request
+
+    Returns:
+        list: a WeatherReport per config, in the config units
+    """
+    keys = [get_cache_key(cfg) for cfg in configs]
+    forecasts = {}
+    misses, miss_request = {}, None
+    stale, stale_request = {}, None
+    for cfg, key in zip(configs, keys):
+        if key in forecasts or key in misses:
+            continue
+        forecast, request = _lookup_forecast(key, profile, hours, days)
+        if forecast is None:
+            misses[key] = cfg
+            miss_request = _merge_requests(miss_request, request)
+            continue
+        forecasts[key] = forecast
+        if request is not None and not FETCH_FLIGHTS.in_flight(key):
+            stale[key] = cfg
+            stale_request = _merge_requests(stale_request, request)
+    if stale:
+        Thread(target=_refresh_forecasts,
+               args=(stale, stale_request, client, batch_size),
+               daemon=True).start()
+    if misses:
+        forecasts.update(_fetch_batches(misses, miss_request, client,
+                                        batch_size))
+    return [forecasts[key].report(cfg.scale)
+            for cfg, key in zip(configs, keys)]
+
+
+def _merge_requests(request: Optional[tuple], other: tuple) -> tuple:
+    if request is None:
+        return other
+    return (max(request[0], other[0], key=PROFILES.index),
+            max(request[1], other[1]),
+            max(request[2], other[2]))
+
+
+def _fetch_batches(configs: Dict[tuple, WeatherConfig], request: tuple,
+                   client: Optional[OpenMeteoClient],
+                   batch_size: int) -> Dict[tuple, CachedForecast]:
+    def fetch(keys: List[tuple]) -> Dict[tuple, CachedForecast]:
+        payloads = fetch_forecasts([configs[key] for key in keys], *request,
+                                   client=client)
+        return {key: _cache_payload(key, payload)
+                for key, payload in zip(keys, payloads)}
+
+    forecasts = {}
+    keys = list(configs)
+    batch_size = max(1, int(batch_size))
+    for start in range(0, len(keys), batch_size):
+        # locations already downloading are waited for, not fetched again
+        batch, shared = FETCH_FLIGHTS.do_many(
+            keys[start:start + batch_size], fetch)
+        # joined downloads for a smaller profile or horizon
+        short = [key for key in shared if not batch[key].covers(*request)]
+        if short:
+            batch.update(fetch(short))
+        forecasts.update(batch)
+    return forecasts
+
+
+def _refresh_forecasts(configs: Dict[tuple, WeatherConfig], request: tuple,
+                       client: Optional[OpenMeteoClient], batch_size: int):
+    try:
+        _fetch_batches(configs, request, client, batch_size)
+    except Exception:
+        LOG.exception(f"Failed to refresh stale forecasts for {list(configs)}")
+
+
+def _lookup_forecast(key: tuple, profile: str, hours: Optional[int],
+                     days: Optional[int]) -> Tuple[Optional[CachedForecast],
+                                                   Optional[tuple]]:
+    """Find a cached forecast answering the request.
+
+    Returns:
+        (forecast, None) on a hit, (None, (profile, hours, days)) to fetch
+        and (forecast, (profile, hours, days)) for a stale forecast that
+        should be refreshed
+    """
+    days = min(days or MAX_FORECAST_DAYS, MAX_FORECAST_DAYS)
+    hours = min(hours or days * 24, MAX_FORECAST_DAYS * 24)
+    forecast, stale = FORECAST_CACHE.get_stale(key)
+    # a store shared with other processes may hold a newer download
+    if (forecast is None or stale) and FORECAST_STORE is not None:
+        stored = FORECAST_STORE.get(key)
+        # only a newer download replaces the cached one, which keeps its
+        # reports and refreshed current conditions
+        if stored is not None and \
+                (forecast is None or stored[1] > forecast.fetched_at) and \
+                _restore_forecast(key, *stored):
+            forecast, stale = FORECAST_CACHE.get_stale(key)
+    if forecast is None:
+        return None, (profile, hours, days)
+    request = _merge_requests((profile, hours, days),
+                              (forecast.profile, *forecast.horizon))
+    if not forecast.covers(profile, hours, days):
+        return None, request
+    return forecast, request if stale else None
+
+
+def _cache_payload(key: tuple, payload: dict,
+                   ttl: float = None) -> CachedForecast:
+    fetched_at = time.time()
+    if FORECAST_STORE is not None:
+        FORECAST_STORE.put(key, payload, fetched_at)
+    forecast = CachedForecast(payload, fetched_at)
+    FORECAST_CACHE.put(key, forecast, ttl=ttl)
+    return forecast
+
+
+async def _async_refresh_forecast(key: tuple, fetch):
+    try:
+        await FETCH_FLIGHTS.async_do(key, fetch)
+    except Exception:
+        LOG.exception(f"Failed to refresh stale forecast for {key}")
+
+
+def _restore_forecast(key: tuple, payload: dict,
+                      fetched_at: float) -> Optional[CachedForecast]:
+    age = max(0.0, time.time() - fetched_at)
+    if age >= FORECAST_CACHE.ttl + FORECAST_CACHE.grace:
+        return None
+    forecast = CachedForecast(payload, fetched_at)
+    forecast.current_at -= age
+    FORECAST_CACHE.put(key, forecast, age=age)
+    return forecast
+
+
+def get_forecast_params(cfg: WeatherConfig, profile: str = PROFILE_STANDARD,
+                        hours: int = MAX_FORECAST_DAYS * 24,
+                        days: int = MAX_FORECAST_DAYS) -> dict:
+    """
+    Build the query parameters of a forecast request.
+
+    Args:
+        cfg (WeatherConfig): the config the report is requested for
+        profile (str): the parameter profile to request
+        hours (int): hourly forecasts to request, starting at the current hour
+        days (int): daily forecasts to request, starting today
+
+    Returns:
+        dict: the Open-Meteo query parameters
+    """
+    hourly_params, daily_params = PROFILE_PARAMS[profile]
+    latitude, longitude = get_grid_point(cfg)
+    return {
+        "longitude": longitude,
+        "latitude": latitude,
         "hourly": ','.join(hourly_params),
         "daily": ','.join(daily_params),
         "current_weather": True,
-        "temperature_unit": temperature_unit,  # fahrenheit
-        "windspeed_unit": windspeed_unit,  # ms, mph, kn
-        "precipitation_unit": precipitation_unit,  # inch
+        "past_hours": 0,
+        "forecast_hours": hours,
+        "forecast_days": days,
+        # always fetch metric, WeatherReport converts locally so every
+        # unit system is served from the same payload
+        "temperature_unit": "celsius",
+        "windspeed_unit": "ms",
+        "precipitation_unit": "mm",
         "timezone": cfg.timezone  # gmt ...
     }
-    url = f"https://api.open-meteo.com/v1/forecast"
-    data = sliced(requests.get(url, params=args).json())
-    return WeatherReport(data)
+
+
+def fetch_forecast(cfg: WeatherConfig, profile: str = PROFILE_STANDARD,
+                   hours: int = MAX_FORECAST_DAYS * 24,
+                   days: int = MAX_FORECAST_DAYS,
+                   client: OpenMeteoClient = None) -> dict:
+    """
+    Download the raw forecast for the config location.
+
+    Args:
+        cfg (WeatherConfig): the config the report is requested for
+        profile (str): the parameter profile to request
+        hours (int): hourly forecasts to request, starting at the current hour
+        days (int): daily forecasts to request, starting today
+        client (OpenMeteoClient): the client to use, defaults to a shared one
+
+    Returns:
+        dict: the Open-Meteo json response
+    """
+    client = client or get_default_client()
+    return client.get_forecast(get_forecast_params(cfg, profile, hours, days))
+
+
+async def async_fetch_forecast(cfg: WeatherConfig,
+                               profile: str = PROFILE_STANDARD,
+                               hours: int = MAX_FORECAST_DAYS * 24,
+                               days: int = MAX_FORECAST_DAYS,
+                               client: OpenMeteoClient = None) -> dict:
+    """
+    Coroutine version of fetch_forecast.
+
+    Args:
+        cfg (WeatherConfig): the config the report is requested for
+        profile (str): the parameter profile to request
+        hours (int): hourly forecasts to request, starting at the current hour
+        days (int): daily forecasts to request, starting today
+        client (OpenMeteoClient): the client to use, defaults to a shared one
+
+    Returns:
+        dict: the Open-Meteo json response
+    """
+    client = client or get_default_client()
+    params = get_forecast_params(cfg, profile, hours, days)
+    return await client.async_get_forecast(params)
+
+
+def fetch_forecasts(configs: List[WeatherConfig],
+                    profile: str = PROFILE_STANDARD,
+                    hours: int = MAX_FORECAST_DAYS * 24,
+                    days: int = MAX_FORECAST_DAYS,
+                    client: OpenMeteoClient = None) -> List[dict]:
+    """
+    Download the raw forecasts for many locations in a single request.
+
+    Args:
+        configs (list): the configs the reports are requested for
+        profile (str): the parameter profile to request
+        hours (int): hourly forecasts to request, starting at the current hour
+        days (int): daily forecasts to request, starting today
+        client (OpenMeteoClient): the client to use, defaults to a shared one
+
+    Returns:
+        list: the Open-Meteo json response of every location, in order
+
+    Raises:
+        ValueError if the API didn't answer for every location
+    """
+    client = client or get_default_client()
+    params = get_forecast_params(configs[0], profile, hours, days)
+    points = [get_grid_point(cfg) for cfg in configs]
+    params["latitude"] = ",".join(str(point[0]) for point in points)
+    params["longitude"] = ",".join(str(point[1]) for point in points)
+    params["timezone"] = ",".join(cfg.timezone for cfg in configs)
+    payloads = client.get_forecast(params)
+    # a single location is answered with an object instead of a list
+    if isinstance(payloads, dict):
+        payloads = [payloads]
+    if len(payloads) != len(configs):
+        raise ValueError(f"Requested {len(configs)} forecasts, "
+                         f"got {len(payloads)}")
+    return payloads
+
+
+def get_current_weather_params(cfg: WeatherConfig) -> dict:
+    """
+    Build the query parameters of a request for the current conditions
+    only, a few hundred bytes instead of the whole forecast.
+
+    Args:
+        cfg (WeatherConfig): the config the report is requested for
+
+    Returns:
+        dict: the Open-Meteo query parameters
+    """
+    latitude, longitude = get_grid_point(cfg)
+    return {
+        "longitude": longitude,
+        "latitude": latitude,
+        "current_weather": True,
+        "temperature_unit": "celsius",
+        "windspeed_unit": "ms",
+        "timezone": cfg.timezone
+    }
+
+
+def fetch_current_weather(cfg: WeatherConfig,
+                          client: OpenMeteoClient = None) -> dict:
+    """
+    Download the current conditions for the config location.
+
+    Args:
+        cfg (WeatherConfig): the config the report is requested for
+        client (OpenMeteoClient): the client to use, defaults to a shared one
+
+    Returns:
+        dict: the current_weather block of the response
+    """
+    client = client or get_default_client()
+    return client.get_forecast(get_current_weather_params(cfg))["current_weather"]
+
+
+async def async_fetch_current_weather(cfg: WeatherConfig,
+                                      client: OpenMeteoClient = None) -> dict:
+    """
+    Coroutine version of fetch_current_weather.
+
+    Args:
+        cfg (WeatherConfig): the config the report is requested for
+        client (OpenMeteoClient): the client to use, defaults to a shared one
+
+    Returns:
+        dict: the current_weather block of the response
+    """
+    client = client or get_default_client()
+    payload = await client.async_get_forecast(get_current_weather_params(cfg))
+    return payload["current_weather"]
@@ -0,0 +1,143 @@
+# Copyright 2021, Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Decide when the home forecast is downloaded ahead of any query."""
+import random
+from datetime import datetime, time, timedelta
+from time import monotonic
+from typing import Optional
+
+from ovos_utils.log import LOG
+
+DEFAULT_INTERVAL = 60 * 60  # Open-Meteo publishes new model runs hourly
+MIN_INTERVAL = 60 * 15
+DEFAULT_JITTER = 60 * 4
+DEFAULT_IDLE_TIMEOUT = 60 * 60 * 6
+PUBLISH_DELAY = 60  # give Open-Meteo time to publish the new hour
+RETRY_DELAY = 60
+TTL_MARGIN = 60 * 15  # keeps the forecast valid over a few failed retries
+
+
+def parse_clock(value: Optional[str]) -> Optional[time]:
+    """Parse a "HH:MM" setting.
+
+    Args:
+        value: the setting, empty or None when not set
+
+    Returns:
+        the time of day or None if unset or invalid
+    """
+    if not value:
+        return None
+    try:
+        return datetime.strptime(str(value).strip(), "%H:%M").time()
+    except ValueError:
+        LOG.warning(f"Ignoring invalid time of day {value}, expected HH:MM")
+        return None
+
+
+class PrefetchScheduler:
+    """Timing and state of the home forecast prefetch.
+
+    Runs are aligned to interval boundaries, the top of the hour by default,
+    plus a random jitter so devices don't all call Open-Meteo at once.
+    Failed runs are retried with exponential back-off.  Nothing is
+    downloaded in quiet hours or once the device saw no activity for
+    idle_timeout seconds.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL,
+                 jitter: float = DEFAULT_JITTER,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 quiet_start: time = None, quiet_end: time = None):
+        self.interval = max(MIN_INTERVAL, interval)
+        self.jitter = jitter
+        self.idle_timeout = idle_timeout
+        self.quiet_start = quiet_start
+        self.quiet_end = quiet_end
+        self.failures = 0
+        self.last_activity = monotonic()
+
+    def configure(self, interval: float = None, idle_timeout: float = None,
+                  quiet_start: str = None, quiet_end: str = None):
+        """Apply the prefetch settings.
+
+        Args:
+            interval: seconds between runs, at least MIN_INTERVAL
+            idle_timeout: seconds without activity before pausing, 0 never
+            quiet_start: "HH:MM" the quiet hours start at, empty disables
+            quiet_end: "HH:MM" the quiet hours end at, empty disables
+        """
+        if interval is not None:
+            self.interval = max(MIN_INTERVAL, float(interval))
+        if idle_timeout is not None:
+            self.idle_timeout = float(idle_timeout)
+        self.quiet_start = parse_clock(quiet_start)
+        self.quiet_end = parse_clock(quiet_end)
+
+    @property
+    def ttl(self) -> float:
+        """Seconds a prefetched forecast stays valid, until the next run."""
+        return self.interval + PUBLISH_DELAY + self.jitter + TTL_MARGIN
+
+    def record_activity(self):
+        """Note that the user interacted with the device."""
+        self.last_activity = monotonic()
+
+    def record_result(self, success: bool):
+        """Note the outcome of a run, failures back off the next one."""
+        self.failures = 0 if success else self.failures + 1
+
+    def is_idle(self) -> bool:
+        """Check if the device saw no activity for idle_timeout seconds."""
+        return bool(self.idle_timeout and
+                    monotonic() - self.last_activity >= self.idle_timeout)
+
+    def in_quiet_hours(self, now: datetime) -> bool:
+        """Check if now falls in the quiet hours, which may span midnight.
+
+        Args:
+            now: the local date and time
+
+        Returns:
+            True if prefetching is paused for the night
+        """
+        start, end = self.quiet_start, self.quiet_end
+        if start is None or end is None or start == end:
+            return False
+        clock = now.time()
+        if start < end:
+            return start <= clock < end
+        return clock >= start or clock < end
+
+    def should_run(self, now: datetime) -> bool:
+        """Check if a prefetch due at now should download anything."""
+        return not (self.is_idle() or self.in_quiet_hours(now))
+
+    def next_run(self, now: datetime) -> datetime:
+        """Pick the time of the next prefetch.
+
+        Args:
+            now: the current date and time
+
+        Returns:
+            the next interval boundary plus jitter, or a back-off delay
+            after a failed run
+        """
+        if self.failures:
+            delay = min(RETRY_DELAY * 2 ** (self.failures - 1), self.interval)
+        else:
+            timestamp = now.timestamp()
+            boundary = (timestamp // self.interval + 1) * self.interval
+            delay = boundary - timestamp + PUBLISH_DELAY
+        return now + timedelta(seconds=delay + random.uniform(0, self.jitter))
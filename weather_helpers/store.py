@@ -0,0 +1,299 @@
+# Copyright 2021, Mycroft AI Inc.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Persist raw Open-Meteo payloads so forecasts survive skill restarts."""
+import hashlib
+import json
+import os
+import zlib
+from tempfile import NamedTemporaryFile
+from threading import RLock
+from time import time
+from typing import Hashable, List, Optional, Tuple
+
+from ovos_utils.log import LOG
+
+from .backends import CacheBackend, SQLiteBackend
+
+DEFAULT_MAX_AGE = 60 * 60 * 24
+DEFAULT_MAX_ENTRIES = 16
+
+
+class ForecastStore:
+    """Keep the last raw payload per location as a json file in a directory.
+
+    Every file holds the cache key, the wall clock time the payload was
+    fetched at and the payload itself.  Writes go to a temporary file that
+    is renamed over the previous one, so a crash never leaves a truncated
+    forecast behind.
+    """
+
+    def __init__(self, path: str, max_age: float = DEFAULT_MAX_AGE,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self._lock = RLock()
+        os.makedirs(self.path, exist_ok=True)
+
+    def get(self, key: Hashable) -> Optional[Tuple[dict, float]]:
+        """Load the payload stored for key.
+
+        Args:
+            key: normalized request key
+
+        Returns:
+            (payload, fetched_at) or None if missing or expired
+        """
+        with self._lock:
+            entry = self._read(self._file_for(key))
+        if entry is None:
+            return None
+        return entry[1], entry[2]
+
+    def put(self, key: Hashable, payload: dict, fetched_at: float = None):
+        """Atomically write the payload for key and enforce the size cap.
+
+        Args:
+            key: normalized request key
+            payload: the raw Open-Meteo response
+            fetched_at: epoch the payload was downloaded at, defaults to now
+        """
+        entry = {"key": list(key),
+                 "fetched_at": fetched_at or time(),
+                 "payload": payload}
+        with self._lock:
+            tmp_path = None
+            try:
+                with NamedTemporaryFile("w", dir=self.path, suffix=".tmp",
+                                        delete=False) as f:
+                    tmp_path = f.name
+                    json.dump(entry, f)
+                os.replace(tmp_path, self._file_for(key))
+            except (OSError, TypeError, ValueError):
+                LOG.exception("Failed to persist forecast")
+                if tmp_path:
+                    self._remove(tmp_path)
+                return
+            self.prune()
+
+    def entries(self, limit: int = None) -> List[Tuple[tuple, dict, float]]:
+        """Load every stored forecast that has not expired.
+
+        Args:
+            limit: only load this many of the most recent forecasts
+
+        Returns:
+            list of (key, payload, fetched_at), most recent first
+        """
+        with self._lock:
+            files = self._newest_files()[:limit]
+            entries = [self._read(path) for _, path in files]
+        return [entry for entry in entries if entry is not None]
+
+    def prune(self):
+        """Delete expired files and the oldest ones above max_entries."""
+        with self._lock:
+            oldest = time() - self.max_age
+            for idx, (mtime, path) in enumerate(self._newest_files()):
+                if idx >= self.max_entries or mtime < oldest:
+                    self._remove(path)
+
+    def clear(self):
+        """Delete every stored forecast."""
+        with self._lock:
+            for path in self._files():
+                self._remove(path)
+
+    def close(self):
+        """Nothing to release, files are closed after every access."""
+
+    def _file_for(self, key: Hashable) -> str:
+        digest = hashlib.sha1(json.dumps(list(key)).encode("utf-8"))
+        return os.path.join(self.path, f"{digest.hexdigest()}.json")
+
+    def _files(self) -> list:
+        return [os.path.join(self.path, name)
+                for name in os.listdir(self.path) if name.endswith(".json")]
+
+    def _newest_files(self) -> List[Tuple[float, str]]:
+        files = []
+        for path in self._files():
+            try:
+                files.append((os.path.getmtime(path), path))
+            except OSError:
+                continue
+        files.sort(reverse=True)
+        return files
+
+    def _read(self, path: str) -> Optional[Tuple[tuple, dict, float]]:
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            LOG.warning(f"Discarding unreadable forecast {path}")
+            self._remove(path)
+            return None
+        if time() - entry["fetched_at"] > self.max_age:
+            self._remove(path)
+            return None
+        return tuple(entry["key"]), entry["payload"], entry["fetched_at"]
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+
+class BackendForecastStore:
+    """Keep the last raw payload per location in a CacheBackend.
+
+    Entries expire through the backend ttl, so stores on a shared backend
+    are also pruned by the other processes using it.  Payloads are stored
+    zlib compressed.
+    """
+
+    def __init__(self, backend: CacheBackend, max_age: float = DEFAULT_MAX_AGE,
+                 max_entries: Optional[int] = DEFAULT_MAX_ENTRIES,
+                 namespace: str = "forecast:"):
+        self.backend = backend
+        self.max_age = max_age
+        self.max_entries = max_entries
+        self.namespace = namespace
+
+    def get(self, key: Hashable) -> Optional[Tuple[dict, float]]:
+        """Load the payload stored for key.
+
+        Args:
+            key: normalized request key
+
+        Returns:
+            (payload, fetched_at) or None if missing or expired
+        """
+        try:
+            blob = self.backend.get(self._key(key))
+        except Exception:
+            LOG.exception("Failed to read from the forecast cache backend")
+            return None
+        entry = self._decode(key, blob)
+        if entry is None:
+            return None
+        return entry["payload"], entry["fetched_at"]
+
+    def put(self, key: Hashable, payload: dict, fetched_at: float = None):
+        """Write the payload for key and enforce the size cap.
+
+        Args:
+            key: normalized request key
+            payload: the raw Open-Meteo response
+            fetched_at: epoch the payload was downloaded at, defaults to now
+        """
+        fetched_at = fetched_at or time()
+        ttl = fetched_at + self.max_age - time()
+        try:
+            if ttl <= 0:
+                self.backend.delete(self._key(key))
+                return
+            entry = {"fetched_at": fetched_at, "payload": payload}
+            blob = zlib.compress(json.dumps(entry).encode("utf-8"))
+            self.backend.set(self._key(key), blob, ttl)
+        except Exception:
+            LOG.exception("Failed to persist forecast")
+            return
+        if self.max_entries:
+            self.prune()
+
+    def entries(self, limit: int = None) -> List[Tuple[tuple, dict, float]]:
+        """Load every stored forecast that has not expired.
+
+        Args:
+            limit: only load this many of the most recent forecasts
+
+        Returns:
+            list of (key, payload, fetched_at), most recent first
+        """
+        try:
+            names = self._newest()[:limit]
+            blobs = self.backend.get_many(names)
+        except Exception:
+            LOG.exception("Failed to read from the forecast cache backend")
+            return []
+        entries = []
+        for name in names:
+            if name not in blobs:
+                continue
+            key = tuple(json.loads(name[len(self.namespace):]))
+            entry = self._decode(key, blobs[name])
+            if entry is not None:
+                entries.append((key, entry["payload"], entry["fetched_at"]))
+        return entries
+
+    def prune(self):
+        """Delete the oldest forecasts above max_entries, the backend
+        expires the others."""
+        if not self.max_entries:
+            return
+        try:
+            self.backend.delete_many(self._newest()[self.max_entries:])
+        except Exception:
+            LOG.exception("Failed to prune the forecast cache backend")
+
+    def _newest(self) -> List[str]:
+        """Every stored name, most recent download first.
+
+        Each entry lives max_age past its download, so the expiry orders
+        the entries without decoding any payload.
+        """
+        ttls = self.backend.ttl_many(self.backend.scan(self.namespace))
+        return sorted(ttls, key=lambda name: ttls[name] or 0, reverse=True)
+
+    def clear(self):
+        """Delete every stored forecast."""
+        self.backend.delete_many(self.backend.scan(self.namespace))
+
+    def close(self):
+        """Close the backend."""
+        self.backend.close()
+
+    def _key(self, key: Hashable) -> str:
+        return self.namespace + json.dumps(list(key))
+
+    def _decode(self, key: Hashable, blob: Optional[bytes]) -> Optional[dict]:
+        if blob is None:
+            return None
+        try:
+            entry = json.loads(zlib.decompress(blob))
+        except (zlib.error, ValueError):
+            LOG.warning(f"Discarding unreadable forecast {key}")
+            try:
+                self.backend.delete(self._key(key))
+            except Exception:
+                pass
+            return None
+        if time() - entry["fetched_at"] > self.max_age:
+            return None
+        return entry
+
+
+class SQLiteForecastStore(BackendForecastStore):
+    """Keep the forecasts in a SQLite database shared by every skill
+    process of the host, see SQLiteBackend."""
+
+    def __init__(self, path: str, max_age: float = DEFAULT_MAX_AGE,
+                 max_entries: int = DEFAULT_MAX_ENTRIES,
+                 timeout: float = 5.0):
+        super().__init__(SQLiteBackend(path, timeout), max_age, max_entries)
@@ -12,16 +12,21 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Utility functions for the weather skill."""
+import json
 from datetime import datetime, timedelta, tzinfo
-from typing import List
-from itertools import islice
 
 import pytz
 from lingua_franca.format import nice_date
 from lingua_franca.parse import extract_datetime
 from ovos_backend_client.api import GeolocationApi
+from ovos_utils.log import LOG
 from ovos_utils.time import now_local, to_local
 
+from .backends import CacheBackend, MemoryBackend
+
+GEOLOCATION_TTL = 60 * 60 * 24 * 30  # places don't move
+GEOLOCATION_CACHE: CacheBackend = MemoryBackend()
+
 
 class LocationNotFoundError(ValueError):
     """Raise when the API cannot find the requested location."""
@@ -83,9 +88,21 @@ def get_tz_info(timezone: str) -> tzinfo:
     return pytz.timezone(timezone)
 
 
+def set_geolocation_cache(backend: CacheBackend):
+    """Cache the geolocation of spoken locations in backend.
+
+    Args:
+        backend: the cache backend, shared with other devices if it is
+    """
+    global GEOLOCATION_CACHE
+    GEOLOCATION_CACHE = backend
+
+
 def get_geolocation(location: str):
     """Retrieve the geolocation information about the requested location.
 
+    Lookups are answered from GEOLOCATION_CACHE for GEOLOCATION_TTL.
+
     Args:
         location: a location specified in the utterance
 
@@ -96,6 +113,24 @@ def get_geolocation(location: str):
     Raises:
         LocationNotFound error if the API returns no results.
     """
+    key = "geolocation:" + location.strip().lower()
+    try:
+        cached = GEOLOCATION_CACHE.get(key)
+        if cached is not None:
+            return json.loads(cached)
+    except Exception:
+        LOG.exception("Failed to read from the geolocation cache")
+
+    geolocation = _lookup_geolocation(location)
+    try:
+        GEOLOCATION_CACHE.set(key, json.dumps(geolocation).encode("utf-8"),
+                              GEOLOCATION_TTL)
+    except Exception:
+        LOG.exception("Failed to write to the geolocation cache")
+    return geolocation
+
+
+def _lookup_geolocation(location: str) -> dict:
     geolocation_api = GeolocationApi()
     geolocation = geolocation_api.get_geolocation(location)
 
@@ -158,17 +193,3 @@ def get_speakable_day_of_week(date_to_speak: datetime, lang: str):
     day_of_week = speakable_date.split(",")[0]
 
     return day_of_week
-
-
-def chunk_list(it: list, size: int) -> List[tuple]:
-    """Takes in a list and chops it in `size` length tuples
-
-    Args:
-        it (list): list to chop
-        size (int): size of the chunks
-
-    Returns:
-        List[tuple]: a list of tuple containing the chunks
-    """
-    it = iter(it)
-    return list(iter(lambda: tuple(islice(it, size)), ()))
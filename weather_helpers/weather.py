@@ -12,12 +12,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """Representations and conversions of the data returned by the weather API."""
-from datetime import timedelta
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from datetime import date, datetime
 from pathlib import Path
-from typing import List, Tuple
+from typing import List, Optional, Tuple, Union
+
+import pytz
+from ovos_utils.time import get_config_tz, now_local
 
 # TODO - get rid of relative imports as soon as skills can be properly packaged with arbitrary module structures
-from .config import MILES_PER_HOUR
+from .config import IMPERIAL, METRIC, MILES_PER_HOUR
 from .util import convert_to_local_datetime
 
 # Forecast timeframes
@@ -90,6 +96,27 @@ ICON_CODE_MAP_ANIMATED = (
     (("50n",), 17),  # mist night
 )
 
+# the maps above flattened to one lookup per icon
+ICON_IMAGES = {icon: name for icons, name in ICON_IMAGE_MAP for icon in icons}
+ICON_ANIMATIONS = {icon: name for icons, name in ICON_ANIMATION_MAP
+                   for icon in icons}
+ICON_CODES = {icon: code for icons, code in ICON_CODE_MAP for icon in icons}
+ICON_CODES_ANIMATED = {icon: code for icons, code in ICON_CODE_MAP_ANIMATED
+                       for icon in icons}
+
+# Unit conversions applied to the canonical metric Open-Meteo payload, keyed by
+# the unit reported in hourly_units/daily_units:
+#   unit -> (converted unit, conversion, decimals kept)
+UNIT_CONVERSIONS = {
+    METRIC: {},
+    IMPERIAL: {
+        "°C": ("°F", lambda value: value * 9 / 5 + 32, 1),
+        "m/s": ("mp/h", lambda value: value * 2.2369362920544, 1),
+        "mm": ("inch", lambda value: value / 25.4, 3),
+        "cm": ("inch", lambda value: value / 2.54, 3),
+    }
+}
+
 THIRTY_PERCENT = 30
 WIND_DIRECTION_CONVERSION = (
     (22.5, "north"),
@@ -105,6 +132,9 @@ WIND_DIRECTION_CONVERSION = (
 
 class WeatherCondition:
     """Data representation of a weather conditions JSON object from the API
+
+    Conditions are interned, every (code, is_day) pair maps to one shared
+    read only instance whose attributes are resolved once.
     WMO Weather interpretation codes (WW)
     Code 	Description
     0 	Clear sky
@@ -122,9 +152,26 @@ class WeatherCondition:
     96, 99 * 	Thunderstorm with slight and heavy hail
     """
 
-    def __init__(self, weather_code: str, is_day: bool = True):
+    __slots__ = ("category", "icon", "description", "id", "image",
+                 "animation", "code", "animated_code", "_frozen")
+
+    def __new__(cls, weather_code: str, is_day: bool = True):
+        key = (int(weather_code), bool(is_day))
+        condition = WEATHER_CONDITIONS.get(key)
+        if condition is None:
+            condition = super().__new__(cls)
+            condition._resolve(*key)
+            condition = WEATHER_CONDITIONS.setdefault(key, condition)
+        return condition
+
+    def __setattr__(self, name, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError("WeatherCondition instances are shared "
+                                 "and can't be modified")
+        super().__setattr__(name, value)
+
+    def _resolve(self, weather_code: int, is_day: bool):
         # TODO - localization + improve icon/category mappings
-        weather_code = int(weather_code)
         if weather_code <= 1: # clear
             self.category = "clear"
             if is_day:
@@ -225,56 +272,48 @@ class WeatherCondition:
         elif weather_code == 99:
             self.description = "thunderstorm-with-heavy-hail"
         self.id = weather_code
+        icon = getattr(self, "icon", None)
+        self.image = str(Path("images", ICON_IMAGES.get(icon, "")))
+        self.animation = str(Path("animations", ICON_ANIMATIONS.get(icon, "")))
+        self.code = ICON_CODES.get(icon)
+        self.animated_code = ICON_CODES_ANIMATED.get(icon)
+        self._frozen = True
 
-    @property
-    def image(self) -> str:
-        """Use the icon to image mapping to determine which image to display."""
-        image_path = Path("images")
-        for icons, image_file_name in ICON_IMAGE_MAP:
-            if self.icon in icons:
-                image_path = image_path.joinpath(image_file_name)
-        return str(image_path)
+    def __repr__(self) -> str:
+        return f"WeatherCondition({self.id}, {getattr(self, 'icon', '')})"
 
-    @property
-    def animation(self) -> str:
-        """Use the icon to animation mapping to determine which animation to display."""
-        image_path = Path("animations")
-        for icons, animation_file_name in ICON_ANIMATION_MAP:
-            if self.icon in icons:
-                image_path = image_path.joinpath(animation_file_name)
-        return str(image_path)
 
-    @property
-    def code(self) -> str:
-        """Use the icon to animation mapping to determine which animation to display."""
-        condition_code = None
-        for icons, code in ICON_CODE_MAP:
-            if self.icon in icons:
-                condition_code = code
-        return condition_code
-
-    @property
-    def animated_code(self) -> str:
-        """Use the icon to animation mapping to determine which animation to display."""
-        condition_code = None
-        for icons, code in ICON_CODE_MAP_ANIMATED:
-            if self.icon in icons:
-                condition_code = code
-        return condition_code
+# every WMO code Open-Meteo uses, resolved at import
+WMO_CODES = (0, 1, 2, 3, 45, 48, 51, 53, 55, 56, 57, 61, 63, 65, 66, 67,
+             71, 73, 75, 77, 80, 81, 82, 85, 86, 95, 96, 99)
+WEATHER_CONDITIONS = {}
+for _code in WMO_CODES:
+    WeatherCondition(_code, True)
+    WeatherCondition(_code, False)
 
 
 class Weather:
     """Abstract data representation of commonalities in forecast types."""
 
+    __slots__ = ("date_time", "units", "pressure", "humidity", "dew_point",
+                 "clouds", "wind_speed", "wind_speed_max", "wind_direction",
+                 "sunrise", "sunset", "temperature", "visibility",
+                 "temperature_low", "temperature_high",
+                 "chance_of_precipitation", "precipitation", "uvindex",
+                 "condition")
+
     def __init__(self, weather: dict, timezone: str, units: dict):
-        self.date_time = convert_to_local_datetime(weather["time"], timezone)
+        self.date_time = weather["time"]
+        if isinstance(self.date_time, str):
+            self.date_time = convert_to_local_datetime(self.date_time, timezone)
         self.units = units  # if any conversion is needed, this tells us the source units in the raw data
         # TODO - handle any missing data that we can derive
         self.pressure = weather.get("surface_pressure")
         self.humidity = weather.get("relativehumidity_2m") or \
                         weather.get("relativehumidity_1000hPa")
-        self.dew_point = weather.get("dewpoint_2m")
-        self.clouds = weather.get("cloudcover")
+        self.dew_point = weather.get("dewpoint_2m",
+                                     weather.get("dewpoint_2m_mean"))
+        self.clouds = weather.get("cloudcover", weather.get("cloudcover_mean"))
         self.wind_speed = weather.get("windspeed_10m")
         self.wind_speed_max = weather.get("windspeed_10m_max") or self.wind_speed
         self.wind_direction = weather.get("winddirection_10m") or weather.get("winddirection_10m_dominant")
@@ -295,8 +334,9 @@ class Weather:
                                        weather.get("precipitation_probability_min") or \
                                        weather.get("precipitation_probability") or 0
         self.precipitation = weather.get("precipitation_sum") or weather.get("precipitation")
-        self.uvindex = weather.get("uv_index_max") or \
-                int(weather.get("shortwave_radiation") * 3.6 / 27.8 )
+        self.uvindex = weather.get("uv_index_max")
+        if self.uvindex is None and weather.get("shortwave_radiation") is not None:
+            self.uvindex = int(weather["shortwave_radiation"] * 3.6 / 27.8)
         self.condition = WeatherCondition(weather["weathercode"])
 
     @staticmethod
@@ -343,39 +383,426 @@ class Weather:
         return wind_strength
 
 
+def convert_units(series: dict, units: dict, scale: str) -> Tuple[dict, dict]:
+    """Convert every column of an hourly or daily block to a unit system.
+
+    Open-Meteo is always queried in metric units, the conversion is applied
+    once per column instead of once per Weather object.
+
+    Args:
+        series: the hourly or daily block of the report, one list per variable
+        units: the matching hourly_units or daily_units block
+        scale: METRIC or IMPERIAL
+
+    Returns:
+        the converted series and their units
+    """
+    converted_series = dict(series)
+    converted_units = dict(units)
+    for name, unit in units.items():
+        if name in series:
+            converted_series[name], converted_units[name] = \
+                convert_column(series[name], unit, scale)
+    return converted_series, converted_units
+
+
+def convert_column(values: list, unit: str, scale: str) -> Tuple[list, str]:
+    """Convert a single hourly or daily variable to a unit system.
+
+    Args:
+        values: the variable, in the unit Open-Meteo sent
+        unit: the unit from hourly_units or daily_units
+        scale: METRIC or IMPERIAL
+
+    Returns:
+        the converted values and their unit, the values themselves if no
+        conversion applies
+    """
+    conversions = UNIT_CONVERSIONS.get(scale) or {}
+    if unit not in conversions:
+        return values, unit
+    converted_unit, convert, decimals = conversions[unit]
+    return [None if value is None else round(convert(value), decimals)
+            for value in values], converted_unit
+
+
+# hourly and daily variables Weather reads
+WEATHER_VARIABLES = (
+    "surface_pressure", "relativehumidity_2m", "relativehumidity_1000hPa",
+    "dewpoint_2m", "dewpoint_2m_mean", "cloudcover", "cloudcover_mean",
+    "windspeed_10m", "windspeed_10m_max", "winddirection_10m",
+    "winddirection_10m_dominant", "sunrise", "sunset", "temperature_2m",
+    "visibility", "temperature_2m_min", "temperature_2m_max",
+    "precipitation_probability_mean", "precipitation_probability_max",
+    "precipitation_probability_min", "precipitation_probability",
+    "precipitation_sum", "precipitation", "uv_index_max",
+    "shortwave_radiation", "weathercode"
+)
+# daily variables holding a time of day
+DATETIME_COLUMNS = ("sunrise", "sunset")
+EPOCH = datetime(1970, 1, 1)
+
+
+def to_column(values: list) -> Union[array, list]:
+    """Pack a series in a typed array when every value is an int or a float.
+
+    Series holding strings or missing values are kept as lists.
+
+    Args:
+        values: an hourly or daily variable
+
+    Returns:
+        an array("q"), an array("d") or the values as a list
+    """
+    types = set(map(type, values))
+    if types == {int}:
+        return array("q", values)
+    if types and types <= {int, float}:
+        return array("d", values)
+    return list(values)
+
+
+class TimeAxis:
+    """The time column of an hourly or daily block, decoded once.
+
+    Open-Meteo renders every time of a response with the same utc offset,
+    so the axis is a start plus a fixed step.  Only the first and last
+    times are parsed, the epochs of the others are computed in bulk and
+    datetimes are built from them when a row is read.  Irregular axes fall
+    back to parsing every time.
+    """
+
+    __slots__ = ("times", "tz", "local_tz", "utc_offset", "epochs", "step")
+
+    def __init__(self, times: list, timezone: str, utc_offset: int = None):
+        self.times = times
+        self.tz = pytz.timezone(timezone)
+        self.local_tz = get_config_tz()
+        self.utc_offset = utc_offset
+        self.step = 0
+        if not times:
+            self.epochs = array("q")
+            return
+        start = self.epoch(times[0])
+        if len(times) > 1:
+            self.step = self.epoch(times[1]) - start
+        step = self.step
+        if self.epoch(times[-1]) == start + step * (len(times) - 1):
+            self.epochs = array("q", (start + step * idx
+                                      for idx in range(len(times))))
+        else:
+            self.epochs = array("q", map(self.epoch, times))
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def epoch(self, isodate: str) -> int:
+        """Convert a time of the report timezone to seconds since epoch."""
+        naive = datetime.fromisoformat(isodate)
+        if self.utc_offset is not None:
+            return int((naive - EPOCH).total_seconds()) - self.utc_offset
+        return int(self.tz.localize(naive).timestamp())
+
+    def datetime(self, idx: int) -> datetime:
+        """The time at idx in the user timezone."""
+        return datetime.fromtimestamp(self.epochs[idx], self.local_tz)
+
+    def parse(self, isodate: str) -> datetime:
+        """Convert any time of the report, like sunrise, to the user
+        timezone."""
+        return datetime.fromtimestamp(self.epoch(isodate), self.local_tz)
+
+    def index(self, when: datetime) -> int:
+        """Find the row whose hour or day contains when.
+
+        Args:
+            when: a timezone aware datetime
+
+        Returns:
+            the row index
+
+        Raises:
+            IndexError when the axis doesn't cover when
+        """
+        timestamp = when.timestamp()
+        idx = bisect_right(self.epochs, timestamp) - 1
+        if idx < 0 or (idx == len(self.epochs) - 1 and self.step and
+                       timestamp >= self.epochs[idx] + self.step):
+            raise IndexError(f"{when} is not covered by the forecast")
+        return idx
+
+    def span(self, start: datetime = None, end: datetime = None) -> range:
+        """Find the rows overlapping [start, end).
+
+        Args:
+            start: a timezone aware datetime, the first row when None
+            end: a timezone aware datetime, past the last row when None
+
+        Returns:
+            the range of row indices, empty if none overlap
+        """
+        lo = 0
+        if start is not None:
+            lo = max(0, bisect_right(self.epochs, start.timestamp()) - 1)
+        hi = len(self.epochs)
+        if end is not None:
+            hi = bisect_left(self.epochs, end.timestamp(), lo)
+        return range(lo, max(lo, hi))
+
+    def day_range(self, day: date) -> range:
+        """Find the rows of a calendar day in the report timezone."""
+        day = day.isoformat()
+        start = bisect_left(self.times, day)
+        return range(start, bisect_right(self.times, day + "T99", start))
+
+
+class ForecastTable:
+    """Columnar storage of an hourly or daily block.
+
+    The table reads the canonical payload in place.  A variable is only
+    converted to the unit system and packed into a column the first time
+    a row needs it, and rows only exist as Weather objects built the first
+    time they are read.  Most intents read a handful of rows, so the cost
+    of a report follows what is read rather than what was requested.
+    """
+
+    __slots__ = ("series", "source_units", "scale", "columns", "time",
+                 "axis", "units", "timezone", "_rows")
+
+    def __init__(self, series: dict, units: dict, timezone: str,
+                 utc_offset: int = None, scale: str = METRIC):
+        self.series = series
+        self.source_units = units
+        self.scale = scale
+        conversions = UNIT_CONVERSIONS.get(scale) or {}
+        self.units = {name: conversions[unit][0] if unit in conversions
+                      else unit for name, unit in units.items()}
+        self.columns = {}
+        self.time = series["time"]
+        self.axis = TimeAxis(self.time, timezone, utc_offset)
+        self.timezone = timezone
+        self._rows = {}
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    def column(self, name: str) -> Optional[Union[array, list]]:
+        """Get a variable in the report unit system, None if missing."""
+        column = self.columns.get(name)
+        if column is None and name in self.series:
+            values, _ = convert_column(self.series[name],
+                                       self.source_units.get(name), self.scale)
+            column = self.columns.setdefault(name, to_column(values))
+        return column
+
+    def row(self, idx: int) -> dict:
+        """Gather the values Weather reads at idx, times decoded."""
+        row = {}
+        for name in WEATHER_VARIABLES:
+            column = self.column(name)
+            if column is not None:
+                row[name] = column[idx]
+        row["time"] = self.axis.datetime(idx)
+        for name in DATETIME_COLUMNS:
+            if isinstance(row.get(name), str):
+                row[name] = self.axis.parse(row[name])
+        return row
+
+    def weather(self, idx: int) -> "Weather":
+        """Get the Weather of the row at idx, built on first use."""
+        weather = self._rows.get(idx)
+        if weather is None:
+            weather = Weather(self.row(idx), self.timezone, self.units)
+            # concurrent readers may both build it, either copy is fine
+            weather = self._rows.setdefault(idx, weather)
+        return weather
+
+
+class WeatherSeries(Sequence):
+    """Read only sequence of Weather over a range of ForecastTable rows.
+
+    Slicing returns another series on the same table, nothing is copied.
+    """
+
+    __slots__ = ("table", "rows")
+
+    def __init__(self, table: ForecastTable, rows: range = None):
+        self.table = table
+        self.rows = range(len(table)) if rows is None else rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return WeatherSeries(self.table, self.rows[idx])
+        return self.table.weather(self.rows[idx])
+
+
+def get_time_offsets(report: dict, now: datetime = None) -> Tuple[int, int]:
+    """Find the current hour and today in the hourly and daily blocks.
+
+    Open-Meteo times are local to the report timezone and sort as strings,
+    so this is a binary search on the raw time axis.
+
+    Args:
+        report: an Open-Meteo response
+        now: the time to look up, defaults to now in the report timezone
+
+    Returns:
+        (hour, day) indices, the current hour is the last one started,
+        past the end once the forecast no longer covers now
+    """
+    if now is None:
+        now = now_local(pytz.timezone(report["timezone"]))
+    hours = report["hourly"]["time"]
+    clock = now.strftime("%Y-%m-%dT%H:%M")
+    hour = bisect_right(hours, clock) - 1
+    if hour == len(hours) - 1 and hours and hours[hour][:13] < clock[:13]:
+        # the last hour is over, nothing is left
+        hour = len(hours)
+    hour = max(0, hour)
+    day = bisect_left(report["daily"]["time"], now.strftime("%Y-%m-%d"))
+    return hour, day
+
+
+# current_weather fields and the hourly variables they observe
+CURRENT_WEATHER_FIELDS = {
+    "temperature": "temperature_2m",
+    "windspeed": "windspeed_10m",
+    "winddirection": "winddirection_10m",
+    "weathercode": "weathercode"
+}
+
+
 class WeatherReport:
-    """Full representation of the data returned by the OpenMeteo API"""
+    """Full representation of the data returned by the OpenMeteo API
+
+    Every hour and day of the report is kept, hourly and daily start at the
+    current hour and today when they are read, so a cached report stays
+    correct across hour and day boundaries.
+    """
+
+    __slots__ = ("timezone", "scale", "_report", "_source_units", "_observed",
+                 "_observed_hour", "_hourly", "_daily")
 
-    def __init__(self, report):
+    def __init__(self, report, scale: str = METRIC):
         timezone = report["timezone"]
-        self.hourly = []
-        for idx, _ in enumerate(report["hourly"]["time"]):
-            r = {k: hour[idx] for k, hour in report["hourly"].items()}
-            # ['time', 'temperature_2m', 'relativehumidity_2m', 'dewpoint_2m', 'apparent_temperature',
-            # 'pressure_msl', 'surface_pressure', 'cloudcover', 'cloudcover_low', 'cloudcover_mid',
-            # 'cloudcover_high', 'windspeed_10m', 'windspeed_80m', 'windspeed_120m', 'windspeed_180m',
-            # 'winddirection_10m', 'winddirection_80m', 'winddirection_120m', 'winddirection_180m',
-            # 'windgusts_10m', 'shortwave_radiation', 'direct_radiation', 'diffuse_radiation',
-            # 'vapor_pressure_deficit', 'cape', 'evapotranspiration', 'et0_fao_evapotranspiration',
-            # 'precipitation', 'weathercode', 'snow_depth', 'showers', 'snowfall', 'visibility',
-            # 'precipitation_probability', 'freezinglevel_height', 'soil_temperature_0cm',
-            # 'soil_temperature_6cm', 'soil_temperature_18cm', 'soil_temperature_54cm',
-            # 'soil_moisture_0_1cm', 'soil_moisture_1_3cm', 'soil_moisture_3_9cm', 'soil_moisture_9_27cm',
-            # 'soil_moisture_27_81cm', 'is_day']
-            self.hourly.append(Weather(r, timezone, report["hourly_units"]))
-        
-        self.current = self.hourly[0]
-
-        self.daily = []
-        for idx, _ in enumerate(report["daily"]["time"]):
-            r = {k: hour[idx] for k, hour in report["daily"].items()}
-            # ['time', 'temperature_2m_max', 'temperature_2m_min', 'apparent_temperature_max',
-            # 'apparent_temperature_min', 'precipitation_sum', 'precipitation_hours', 'weathercode',
-            # 'sunrise', 'sunset', 'windspeed_10m_max', 'windgusts_10m_max', 'winddirection_10m_dominant',
-            # 'shortwave_radiation_sum', 'et0_fao_evapotranspiration', 'uv_index_max',
-            # 'precipitation_probability_mean', 'precipitation_probability_min', 'precipitation_probability_max',
-            # 'uv_index_clear_sky_max']
-            self.daily.append(Weather(r, timezone, report["daily_units"]))
+        self.timezone = timezone
+        self.scale = scale
+        self._report = report
+        self._source_units = report["hourly_units"]
+        self._observed = None
+        self._observed_hour = None
+        utc_offset = report.get("utc_offset_seconds")
+        self._hourly = ForecastTable(report["hourly"], report["hourly_units"],
+                                     timezone, utc_offset, scale)
+        self._daily = ForecastTable(report["daily"], report["daily_units"],
+                                    timezone, utc_offset, scale)
+        # hourly columns:
+        # ['time', 'temperature_2m', 'relativehumidity_2m', 'dewpoint_2m', 'apparent_temperature',
+        # 'pressure_msl', 'surface_pressure', 'cloudcover', 'cloudcover_low', 'cloudcover_mid',
+        # 'cloudcover_high', 'windspeed_10m', 'windspeed_80m', 'windspeed_120m', 'windspeed_180m',
+        # 'winddirection_10m', 'winddirection_80m', 'winddirection_120m', 'winddirection_180m',
+        # 'windgusts_10m', 'shortwave_radiation', 'direct_radiation', 'diffuse_radiation',
+        # 'vapor_pressure_deficit', 'cape', 'evapotranspiration', 'et0_fao_evapotranspiration',
+        # 'precipitation', 'weathercode', 'snow_depth', 'showers', 'snowfall', 'visibility',
+        # 'precipitation_probability', 'freezinglevel_height', 'soil_temperature_0cm',
+        # 'soil_temperature_6cm', 'soil_temperature_18cm', 'soil_temperature_54cm',
+        # 'soil_moisture_0_1cm', 'soil_moisture_1_3cm', 'soil_moisture_3_9cm', 'soil_moisture_9_27cm',
+        # 'soil_moisture_27_81cm', 'is_day']
+        # daily columns:
+        # ['time', 'temperature_2m_max', 'temperature_2m_min', 'apparent_temperature_max',
+        # 'apparent_temperature_min', 'precipitation_sum', 'precipitation_hours', 'weathercode',
+        # 'sunrise', 'sunset', 'windspeed_10m_max', 'windgusts_10m_max', 'winddirection_10m_dominant',
+        # 'shortwave_radiation_sum', 'et0_fao_evapotranspiration', 'uv_index_max',
+        # 'precipitation_probability_mean', 'precipitation_probability_min', 'precipitation_probability_max',
+        # 'uv_index_clear_sky_max']
+
+        if report.get("current_weather"):
+            self.update_current(report["current_weather"])
+
+    @property
+    def hourly(self) -> WeatherSeries:
+        """The hourly forecasts, starting at the current hour."""
+        hour, _ = get_time_offsets(self._report)
+        return WeatherSeries(self._hourly, range(hour, len(self._hourly)))
+
+    @property
+    def daily(self) -> WeatherSeries:
+        """The daily forecasts, starting today."""
+        _, day = get_time_offsets(self._report)
+        return WeatherSeries(self._daily, range(day, len(self._daily)))
+
+    @property
+    def current(self) -> Weather:
+        """The observed conditions if they are from the current hour, the
+        forecast for the current hour otherwise."""
+        hour, _ = get_time_offsets(self._report)
+        if self._observed is not None and self._observed_hour == hour:
+            return self._observed
+        return self._hourly.weather(hour)
+
+    def update_current(self, current_weather: dict):
+        """Replace the current conditions with a newer observation.
+
+        The observed values override those forecast for the hour they were
+        observed in, the variables current_weather doesn't hold are kept.
+
+        Args:
+            current_weather: the current_weather block of an Open-Meteo
+                             response, in metric units
+        """
+        hours = self._hourly.time
+        observed_at = current_weather.get("time")
+        if not hours or not observed_at:
+            return
+        hour = max(0, bisect_right(hours, observed_at) - 1)
+        observed = {variable: [current_weather[field]]
+                    for field, variable in CURRENT_WEATHER_FIELDS.items()
+                    if current_weather.get(field) is not None}
+        observed, _ = convert_units(observed, self._source_units, self.scale)
+        row = self._hourly.row(hour)
+        row.update({variable: values[0] for variable, values in observed.items()})
+        row["time"] = self._hourly.axis.parse(observed_at)
+        self._observed = Weather(row, self.timezone, self._hourly.units)
+        self._observed_hour = hour
+
+    def at(self, when: datetime, timeframe: str = HOURLY) -> Weather:
+        """Get the forecast for the hour or the day containing when.
+
+        Args:
+            when: a timezone aware datetime
+            timeframe: HOURLY or DAILY
+
+        Returns:
+            the forecast
+
+        Raises:
+            IndexError when the report doesn't cover when
+        """
+        table = self._daily if timeframe == DAILY else self._hourly
+        return table.weather(table.axis.index(when))
+
+    def between(self, start: datetime = None, end: datetime = None,
+                timeframe: str = HOURLY) -> WeatherSeries:
+        """Get the forecasts of the hours or days overlapping [start, end).
+
+        Args:
+            start: a timezone aware datetime, the first forecast when None
+            end: a timezone aware datetime, the last forecast when None
+            timeframe: HOURLY or DAILY
+
+        Returns:
+            the forecasts, possibly none
+        """
+        table = self._daily if timeframe == DAILY else self._hourly
+        return WeatherSeries(table, table.axis.span(start, end))
+
+    def hours_of_day(self, day: date) -> WeatherSeries:
+        """Get the hourly forecasts of a calendar day of the report timezone.
+        """
+        return WeatherSeries(self._hourly, self._hourly.axis.day_range(day))
 
     def get_weather_for_intent(self, intent_data) -> Weather:
         """Use the intent to determine which forecast satisfies the request.
@@ -395,18 +822,18 @@ class WeatherReport:
     def get_forecast_for_date(self, intent_data) -> Weather:
         """Use the intent to determine which daily forecast(s) satisfies the request.
 
+        The intent datetime is midnight at the requested location, which is
+        a different instant than midnight in the report timezone, so the
+        day is matched on its calendar date.
+
         Args:
             intent_data: Parsed intent data
         """
-        if intent_data.intent_datetime.date() == intent_data.location_datetime.date():
-            forecast = self.daily[0]
-        else:
-            delta = intent_data.intent_datetime - intent_data.location_datetime
-            day_delta = int(delta / timedelta(days=1))
-            day_index = day_delta + 1
-            forecast = self.daily[day_index]
-
-        return forecast
+        days = self._daily.axis.day_range(intent_data.intent_datetime.date())
+        if not days:
+            raise IndexError(f"{intent_data.intent_datetime.date()} is not "
+                             f"covered by the forecast")
+        return self._daily.weather(days.start)
 
     def get_forecast_for_multiple_days(self, days: int) -> List[Weather]:
         """Use the intent to determine which daily forecast(s) satisfies the request.
@@ -436,14 +863,9 @@ class WeatherReport:
         Returns:
             A single hour of forecast data based on the intent data
         """
-        delta = intent_data.intent_datetime - intent_data.location_datetime
-        hour_delta = int(delta / timedelta(hours=1))
-        hour_index = hour_delta + 1
-        report = self.hourly[hour_index]
-
-        return report
+        return self.at(intent_data.intent_datetime)
 
-    def get_forecast_for_multiple_hours(self, intent_data) ->List[Weather]:
+    def get_forecast_for_multiple_hours(self, intent_data) -> WeatherSeries:
         """Use the intent to determine which hourly forecasts satisfies the request.
         The hourly up from the requested timeframe are returned
 
@@ -452,13 +874,12 @@ class WeatherReport:
 
         Returns:
             List of hourly forecasts
-        """
-        delta = intent_data.intent_datetime - intent_data.location_datetime
-        hour_delta = int(delta / timedelta(hours=1))
-        hour_index = hour_delta + 1
-        forecast = self.hourly[hour_index:]
 
-        return forecast 
+        Raises:
+            IndexError when the report doesn't cover the requested hour
+        """
+        start = self._hourly.axis.index(intent_data.intent_datetime)
+        return WeatherSeries(self._hourly, range(start, len(self._hourly)))
 
     def get_weekend_forecast(self) -> List[Weather]:
         """Use the intent to determine which daily forecast(s) satisfies the request.
@@ -466,13 +887,14 @@ class WeatherReport:
         Returns:
             The Saturday and Sunday forecast from the list of daily forecasts
         """
-        forecast = list()
-        for forecast_day in self.daily:
-            report_date = forecast_day.date_time.date()
-            if report_date.weekday() in (SATURDAY, SUNDAY):
-                forecast.append(forecast_day)
-
-        return forecast
+        _, today = get_time_offsets(self._report)
+        if today >= len(self._daily):
+            return []
+        weekday = date.fromisoformat(self._daily.time[today][:10]).weekday()
+        days = sorted(today + (weekend_day - weekday) % 7
+                      for weekend_day in (SATURDAY, SUNDAY))
+        return [self._daily.weather(day) for day in days
+                if day < len(self._daily)]
 
     def get_next_precipitation(self, intent_data) -> Tuple[Weather, str]:
         """Determine when the next chance of precipitation is in the forecast.
@@ -484,12 +906,13 @@ class WeatherReport:
             The weather report containing the next chance of rain and the timeframe of
             the selected report.
         """
+        now = intent_data.location_datetime
+        axis = self._hourly.axis
+        hours = range(axis.span(now).start, axis.day_range(now.date()).stop)
         report = None
         current_precipitation = True
         timeframe = HOURLY
-        for hourly in self.hourly:
-            if hourly.date_time.date() > intent_data.location_datetime.date():
-                break
+        for hourly in WeatherSeries(self._hourly, hours):
             if hourly.chance_of_precipitation > THIRTY_PERCENT:
                 if not current_precipitation:
                     report = hourly
@@ -499,9 +922,9 @@ class WeatherReport:
 
         if report is None:
             timeframe = DAILY
-            for daily in self.daily:
-                if daily.date_time.date() == intent_data.location_datetime.date():
-                    continue
+            tomorrow = self._daily.axis.span(now).start + 1
+            for daily in WeatherSeries(self._daily,
+                                       range(tomorrow, len(self._daily))):
                 if daily.chance_of_precipitation > THIRTY_PERCENT:
                     report = daily
                     break